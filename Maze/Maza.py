@@ -1,33 +1,39 @@
-from heapq import heappop, heappush
-
 from manim import *
-from random import shuffle, seed
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
 
-config.background_color = "#3B4252"
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.palette import BACKGROUND, red, orange, yellow, green, purple, gray, white
+from common.replay import Seek, StepReplay
+from common.schedule import FrameBudget
+from common.segments import SegmentedScene
+from common.tex_cache import tex_cache
 
-red = "#BF616A"
-orange = "#D08770"
-yellow = "#EBCB8B"
-green = "#A3BE8C"
-purple = "#B48EAD"
-gray = "#D8DEE9"
-white = "#ECEFF4"
+from generators import GENERATORS
+from grid import Grid, OFFSET, OFFSET_REVERSE, WALL_BIT
+from raster import RasterMaze
+from search import search
+from store import MazeStore
+from trace_file import read_trace, write_trace
+from tree_index import TreeIndex
+from viewport import Viewport
+from walls import MazeWalls
 
-seed(4843)
+config.background_color = BACKGROUND
 
 
 class Cell(VGroup):
-    def __init__(self, i: int, j: int, cell_size: float = 1, **kwargs):
+    def __init__(self, i: int, j: int, cell_size: float = 1, walls: bool = True, **kwargs):
         super().__init__(**kwargs)
         self.x, self.y = i, j
-        self.wall = {"Top": True, "Right": True, "Down": True, "Left": True}
+        self.wall = {"Top": walls, "Right": walls, "Down": walls, "Left": walls}
         self.wall_lines = {"Top": None, "Right": None, "Down": None, "Left": None}
-        self.visited = False
-        # for tracing back the path
-        self.prev_cell = None
 
         # Create the square and edges based on the specified properties
-        self.square = Square(side_length=cell_size, stroke_opacity=0, fill_color="#3B4252",
+        self.square = Square(side_length=cell_size, stroke_opacity=0, fill_color=BACKGROUND,
                              fill_opacity=0.5).set_z_index(
             -1)
         self.add(self.square)
@@ -66,77 +72,162 @@ class Cell(VGroup):
         self.remove(self.wall_lines[edge])
         self.wall_lines[edge] = None
 
+    def set_walls(self, mask):
+        """Show only the walls in a Grid bitmask, for cells a Viewport recycles."""
+        for edge, bit in WALL_BIT.items():
+            self.wall[edge] = bool(mask & bit)
+            self.wall_lines[edge].set_stroke(opacity=1 if self.wall[edge] else 0)
+
 
 class Maze:
 
-    def __init__(self, rows: int, cols: int, cell_size: float = 1):
+    def __init__(self, rows: int, cols: int, cell_size: float = 1, display: str = "cells", seed=None):
         self.rows = rows
         self.cols = cols
-        self.offset = {"Right": (0, 1), "Down": (1, 0), "Left": (0, -1), "Top": (-1, 0)}
-        self.offset_reverse = {"Right": "Left", "Down": "Top", "Left": "Right", "Top": "Down"}
-        self.maze = [[Cell(i, j, cell_size) for j in range(self.cols)] for i in range(self.rows)]
+        self.cell_size = cell_size
+        # a seeded maze carves the same way however much else draws from the random module
+        self.seed = seed
+        self.rng = random if seed is None else random.Random(seed)
+        # "cells": four Lines per Cell, "merged": one deduplicated MazeWalls for the whole grid,
+        # "raster": one pixel buffer for walls and cells, see RasterMaze,
+        # "viewport": only the cells around the view exist, see Viewport
+        self.display = display
+        self.offset = OFFSET
+        self.offset_reverse = OFFSET_REVERSE
+        # all algorithms run on the compact grid, Cell mobjects are only built by build_display()
+        self.grid = Grid(rows, cols)
+        self.maze = None
+        self.walls = None
+        self.raster = None
+        self.viewport = None
         self.maze_display = None
         self.action_steps = []
         self.solution_steps = []
         self.trace_back_steps = []
+        self.goal = (rows - 1, cols - 1)
+        self.search_result = None
+        # built on demand by build_tree_index, dropped whenever the grid changes
+        self.tree_index = None
 
     def recursive_backtracker(self):
+        self.generate("recursive_backtracker")
+
+    def generate(self, algorithm="recursive_backtracker"):
+        """Carve the grid with one of generators.GENERATORS, recording every step in action_steps.
+
+        Generating again starts over from a grid with every wall standing.
+        """
+        if self.maze is not None and self.walls is None:
+            # removed Lines can't be put back
+            raise ValueError("the cells of this maze are already built, call build_display() after generate()")
+        self.grid.reset()
         self.action_steps.clear()
-        st = [(0, 0, None)]
-        self.maze[0][0].visited = True
-
-        while st:
-            cur_x, cur_y, prev_cell_wall_to_remove = st.pop()
-            if prev_cell_wall_to_remove:
-                self.destroy_wall(cur_x, cur_y, prev_cell_wall_to_remove)
-
-            available_neighbors = []
-            for direction in self.offset:
-                offset_x, offset_y = self.offset[direction]
-                next_x, next_y = cur_x + offset_x, cur_y + offset_y
-                if 0 <= next_x < self.rows and 0 <= next_y < self.cols and not self.maze[next_x][next_y].visited:
-                    available_neighbors.append((next_x, next_y, direction))
-            shuffle(available_neighbors)
-            for next_x, next_y, direction in available_neighbors:
-                self.maze[next_x][next_y].visited = True
-                st.append((next_x, next_y, direction))
+        self.solution_steps.clear()
+        self.trace_back_steps.clear()
+        self.search_result = None
+        self.tree_index = None
+        # the raster, merged and viewport displays show every wall again
+        self.show_carved()
+        kwargs = {"rng": self.rng}
+        if algorithm == "recursive_backtracker":
+            self.grid.reset_visited()
+            kwargs["visited"] = self.grid.visited
+        for _, (cur_x, cur_y, cur_direction) in GENERATORS[algorithm](self.rows, self.cols, **kwargs):
+            self.destroy_wall(cur_x, cur_y, self.offset_reverse[cur_direction])
 
     def destroy_wall(self, cur_x, cur_y, prev_direction):
         prev_x, prev_y = cur_x - self.offset[prev_direction][0], cur_y - self.offset[prev_direction][1]
-        self.maze[prev_x][prev_y].wall[prev_direction] = False
+        self.grid.remove_wall(prev_x, prev_y, prev_direction)
         cur_direction = self.offset_reverse[prev_direction]
-        self.maze[cur_x][cur_y].wall[cur_direction] = False
         self.action_steps.append(((prev_x, prev_y, prev_direction), (cur_x, cur_y, cur_direction)))
 
-    def A_star(self, star_x=0, star_y=0, end_x=None, end_y=None):
-        self.solution_steps.clear()
-        dis_from_start = [[float("inf") for _ in range(self.cols)] for _ in range(self.rows)]
-        # (f_val, (x, y, dis_from_start[x][y]))
-        pq = [(0, (star_x, star_y, 0))]
-
-        while pq:
-            f_val, (cur_x, cur_y, cur_dis) = heappop(pq)
-            dis_from_start[cur_x][cur_y] = cur_dis
-            self.solution_steps.append((cur_x, cur_y, cur_dis, self.maze[cur_x][cur_y].prev_cell))
-            if cur_x == end_x and cur_y == end_y:
-                return
-            for direction in self.offset:
-                offset_x, offset_y = self.offset[direction]
-                next_x, next_y = cur_x + offset_x, cur_y + offset_y
-                if 0 <= next_x < self.rows and 0 <= next_y < self.cols and not self.maze[cur_x][cur_y].wall[direction]:
-                    if dis_from_start[next_x][next_y] > cur_dis + 1:
-                        self.maze[next_x][next_y].prev_cell = (cur_x, cur_y)
-                        g, h = cur_dis + 1, (self.rows - 1 - next_x) ** 2 + (self.cols - 1 - next_y) ** 2
-                        f = g + h
-                        dis_from_start[next_x][next_y] = g
-                        heappush(pq, (f, (next_x, next_y, g)))
-
-    def get_maze(self):
-        self.recursive_backtracker()
+    def A_star(self, star_x=0, star_y=0, end_x=None, end_y=None, algorithm="a_star", prune=False):
+        end_x = self.rows - 1 if end_x is None else end_x
+        end_y = self.cols - 1 if end_y is None else end_y
+        self.goal = (end_x, end_y)
+        self.search_result = search(self.grid, (star_x, star_y), self.goal, algorithm=algorithm, prune=prune)
+        self.solution_steps[:] = self.search_result.solution_steps
+        return self.search_result
+
+    def build_display(self):
+        if self.display == "raster":
+            self.raster = RasterMaze(self.rows, self.cols, cell_color=BACKGROUND, wall_color=white)
+            self.maze_display = Group(self.raster.mobject(self.cell_size))
+            return self.maze_display
+        if self.display == "viewport":
+            self.viewport = Viewport(self, lambda: Cell(0, 0, self.cell_size), config.frame_width,
+                                     config.frame_height, cell_color=BACKGROUND)
+            self.maze_display = self.viewport.follow(ORIGIN)
+            return self.maze_display
+        merged = self.display == "merged"
+        self.maze = [[Cell(i, j, self.cell_size, walls=not merged) for j in range(self.cols)]
+                     for i in range(self.rows)]
         self.maze_display = VGroup(*[self.maze[i][j] for i in range(self.rows) for j in range(self.cols)])
         self.maze_display.arrange_in_grid(self.rows, self.cols, buff=0)
+        if merged:
+            self.walls = MazeWalls(self.rows, self.cols, self.cell_size, color=white)
+            self.maze_display.add(self.walls)
         return self.maze_display
 
+    def cell_center(self, x, y):
+        return np.array([(y - (self.cols - 1) / 2) * self.cell_size, ((self.rows - 1) / 2 - x) * self.cell_size, 0])
+
+    def remove_wall_display(self, action):
+        """Remove both sides of a carved wall from the display, returns the mobjects to fade out."""
+        (cur_x, cur_y, cur_edge), (next_x, next_y, next_edge) = action
+        if self.raster is not None:
+            # the pixels change in place, nothing to fade
+            self.raster.remove_wall(cur_x, cur_y, cur_edge)
+            return []
+        if self.viewport is not None:
+            self.viewport.remove_wall(cur_x, cur_y, cur_edge)
+            return []
+        if self.walls is not None:
+            return [self.walls.remove_wall(cur_x, cur_y, cur_edge)]
+        lines = [self.maze[cur_x][cur_y].wall_lines[cur_edge], self.maze[next_x][next_y].wall_lines[next_edge]]
+        self.maze[cur_x][cur_y].remove_edge(cur_edge)
+        self.maze[next_x][next_y].remove_edge(next_edge)
+        return lines
+
+    @property
+    def syncs_walls(self):
+        """Whether the display can jump to any wall bitmasks, the Cell display only carves step by step."""
+        return self.raster is not None or self.viewport is not None or self.walls is not None
+
+    def show_carved(self, walls=None):
+        """Bring the display up to the carved grid at once, without replaying action_steps.
+
+        ``walls`` shows other wall bitmasks instead, e.g. a partly carved grid, if ``syncs_walls``.
+        """
+        walls = self.grid.walls if walls is None else walls
+        if self.raster is not None:
+            self.raster.sync(walls)
+        elif self.viewport is not None:
+            self.viewport.sync(walls)
+        elif self.walls is not None:
+            self.walls.sync(walls)
+        else:
+            for action in self.action_steps:
+                self.remove_wall_display(action)
+
+    def mark_cell(self, x, y, color, inset=0.0):
+        """Colour cell (x, y), returns the mobject that changed."""
+        if self.raster is not None:
+            self.raster.fill_cell(x, y, color, inset)
+            return self.raster.image
+        if self.viewport is not None:
+            return self.viewport.mark(x, y, color)
+        return self.maze[x][y].square.set_color(color)
+
+    @property
+    def marks_in_place(self):
+        """Whether cells are coloured without a mobject per cell to animate, so steps are shown with waits."""
+        return self.raster is not None or self.viewport is not None
+
+    def get_maze(self, algorithm="recursive_backtracker"):
+        self.generate(algorithm)
+        return self.build_display()
+
     def get_action_steps(self):
         return self.action_steps
 
@@ -144,12 +235,46 @@ class Maze:
         return self.solution_steps
 
     def get_trace_back_steps(self):
-        prev_cell = (self.rows - 1, self.cols - 1)
+        self.trace_back_steps.clear()
+        prev_cell = self.goal
         while prev_cell:
             self.trace_back_steps.append(prev_cell)
-            prev_cell = self.maze[prev_cell[0]][prev_cell[1]].prev_cell
+            prev_cell = self.grid.prev_cell(*prev_cell)
         return self.trace_back_steps
 
+    def build_tree_index(self, root=(0, 0)):
+        """Index the carved maze for repeated path queries, raises ValueError unless it is perfect."""
+        self.tree_index = TreeIndex(self.grid, root)
+        return self.tree_index
+
+    def shortest_path(self, start, goal):
+        """Cells from start to goal without a search, see TreeIndex."""
+        if self.tree_index is None:
+            self.build_tree_index()
+        return self.tree_index.path(start, goal)
+
+    def save_trace(self, path):
+        write_trace(path, self.action_steps, self.solution_steps, self.trace_back_steps,
+                    meta={"rows": self.rows, "cols": self.cols, "goal": list(self.goal)})
+
+    def load_trace(self, path):
+        """Rebuild the carved grid and all step lists from a file written by save_trace."""
+        trace = read_trace(path)
+        if (trace.meta["rows"], trace.meta["cols"]) != (self.rows, self.cols):
+            raise ValueError(f"{path} holds a {trace.meta['rows']}x{trace.meta['cols']} maze, "
+                             f"not {self.rows}x{self.cols}")
+        self.grid = Grid(self.rows, self.cols)
+        self.tree_index = None
+        self.action_steps.clear()
+        for _, (cur_x, cur_y, cur_direction) in trace.action_steps():
+            self.destroy_wall(cur_x, cur_y, self.offset_reverse[cur_direction])
+        self.solution_steps[:] = trace.solution_steps()
+        self.trace_back_steps[:] = trace.trace_back_steps()
+        for cell, prev_cell in zip(self.trace_back_steps, self.trace_back_steps[1:]):
+            self.grid.set_prev_cell(*cell, prev_cell)
+        self.goal = tuple(trace.meta["goal"])
+        return trace
+
 
 class Figure(ImageMobject):
     def __init__(self, size_scale, file_name, **kwargs):
@@ -165,66 +290,211 @@ class Figure(ImageMobject):
             self.current_direction = target_direction
 
 
-class Test(Scene):
-    def construct(self):
-        SIZE = 0.6
+class Test(SegmentedScene):
+    SIZE = 0.6
+    ROWS, COLS = 12, 20
+    # "merged" draws each wall once, see MazeWalls; "raster" draws the whole maze into one image, see RasterMaze;
+    # "viewport" only builds the cells in view, see Viewport and Follow
+    DISPLAY = "cells"
+    # None plays every step on its own, otherwise each phase is replayed in one play call
+    STEPS_PER_FRAME = None
+    # seconds per phase, the middle steps are fast-forwarded when they don't fit; overrides STEPS_PER_FRAME
+    DURATION = None
+    # any of search.ALGORITHMS
+    SEARCH = "a_star"
+    # any of generators.GENERATORS
+    GENERATOR = "recursive_backtracker"
+    SEED = 4843
+
+    # (segment, state it starts from), see SegmentedScene
+    segments = (
+        ("generation", None),
+        ("solution", "carved_maze"),
+        ("trace_back", "searched_maze"),
+        ("code", None),
+    )
+
+    def maze_params(self):
+        return {"rows": self.ROWS, "cols": self.COLS, "seed": self.SEED, "generator": self.GENERATOR,
+                "search": self.SEARCH}
+
+    def cache_params(self):
+        return {**self.maze_params(), "size": self.SIZE, "display": self.DISPLAY,
+                "steps_per_frame": self.STEPS_PER_FRAME, "duration": self.DURATION}
+
+    def setup(self):
+        # everything headless is computed up front, the segments only animate it
+        self.graph = Maze(self.ROWS, self.COLS, cell_size=self.SIZE, display=self.DISPLAY, seed=self.SEED)
+        store = MazeStore()
+        if not store.load(self.graph, self.maze_params()):
+            self.graph.generate(self.GENERATOR)
+            self.graph.A_star(end_x=self.graph.rows - 1, end_y=self.graph.cols - 1, algorithm=self.SEARCH)
+            self.graph.get_trace_back_steps()
+            store.save(self.graph, self.maze_params())
+        # segments rendered in parallel would all write the same file
+        if self.segment in (None, self.segments[0][0]):
+            self.graph.save_trace("maze_trace.mzt")
+
+    def distance_labels(self):
+        graph = self.graph
+        solution_steps = graph.get_solution_steps()
+        if graph.marks_in_place:
+            # one label per expanded cell is what these displays are meant to avoid, visited cells are coloured
+            return VGroup()
+        with self.phase("labels"):
+            tex_cache.warm((Tex, (str(dis),), {}) for dis in {step[2] for step in solution_steps})
+        return VGroup(*[tex_cache.get(Tex, str(dis)).set_color(white).scale(0.8)
+                        .move_to(graph.cell_center(x, y)) for x, y, dis, _ in solution_steps])
+
+    def visit(self, step):
+        x, y = step[:2]
+        return self.graph.mark_cell(x, y, purple, inset=0.25)
+
+    def follow(self, point):
+        """Keep ``point`` in view, only scenes with a moving camera do anything."""
+
+    def carved_maze(self):
+        self.maze_display = self.graph.build_display()
+        self.graph.show_carved()
+        self.add(self.maze_display)
+
+    def searched_maze(self):
+        self.carved_maze()
+        self.solution_steps_VGroup = self.distance_labels()
+        if self.graph.marks_in_place:
+            for step in self.graph.get_solution_steps():
+                self.visit(step)
+        self.add(self.solution_steps_VGroup)
+
+    def play_steps(self, mobject, steps, play_step, apply_step, seek=None):
+        """Play every step, replay them STEPS_PER_FRAME at a time, or fit them into DURATION seconds.
+
+        ``play_step`` animates one step with its own play call, ``apply_step`` applies it instantly.
+        ``seek(k)``, if given, puts the scene straight into its state after k steps; the fast-forwards then
+        jump once per frame instead of applying every step.
+        """
+        if self.DURATION:
+            for kind, start, end, run_time in FrameBudget(len(steps), self.DURATION, detail_run_time=0.1).plan():
+                if kind == "detail":
+                    for step in steps[start:end]:
+                        play_step(step)
+                elif seek:
+                    self.play(Seek(mobject, seek, start, end, run_time=run_time))
+                else:
+                    self.play(StepReplay(mobject, steps[start:end], apply_step, run_time=run_time))
+        elif self.STEPS_PER_FRAME and seek:
+            self.play(Seek(mobject, seek, 0, len(steps),
+                           run_time=max(len(steps), 1) / (self.STEPS_PER_FRAME * config.frame_rate)))
+        elif self.STEPS_PER_FRAME:
+            self.play(StepReplay(mobject, steps, apply_step, steps_per_frame=self.STEPS_PER_FRAME))
+        else:
+            for step in steps:
+                play_step(step)
+
+    def generation(self):
+        SIZE, graph = self.SIZE, self.graph
         # Maze Animation
-        graph = Maze(12, 20, cell_size=SIZE)
-        maze_display = graph.get_maze()
-        self.play(Create(maze_display), run_time=graph.rows * graph.cols * 0.025)
+        maze_display = self.maze_display = graph.build_display()
+        # an image can't be drawn stroke by stroke
+        intro = FadeIn if graph.raster is not None else Create
+        self.play(intro(maze_display), run_time=min(graph.rows * graph.cols * 0.025, 10))
         self.wait()
 
         action_steps = graph.get_action_steps()
-        with open('action_steps.txt', 'w') as f:
-            for action in action_steps:
-                f.write(str(action) + '\n')
 
         # Maze Generation Animation
-        pac_man = Figure(SIZE * 0.1, "images\\pacman.png").move_to(graph.maze[0][0].get_center())
+        pac_man = Figure(SIZE * 0.1, "images\\pacman.png").move_to(graph.cell_center(0, 0))
         self.add(pac_man)
 
-        for action in action_steps:
+        def move_pac_man(action):
             cur_x, cur_y, cur_edge_to_be_remove = action[0]
-            next_x, next_y, next_edge_to_be_remove = action[1]
-            pac_man.move_to(graph.maze[cur_x][cur_y].get_center())
+            pac_man.move_to(graph.cell_center(cur_x, cur_y))
             pac_man.set_direction(cur_edge_to_be_remove)
-            self.play(FadeOut(graph.maze[cur_x][cur_y].wall_lines[cur_edge_to_be_remove]),
-                      FadeOut(graph.maze[next_x][next_y].wall_lines[next_edge_to_be_remove]),
-                      run_time=0.1)
-            graph.maze[cur_x][cur_y].remove_edge(cur_edge_to_be_remove)
-            graph.maze[next_x][next_y].remove_edge(next_edge_to_be_remove)
+            self.follow(pac_man.get_center())
+
+        def carve(action):
+            move_pac_man(action)
+            return graph.remove_wall_display(action)
+
+        # the walls after k carvings are replayed on a headless grid, the display jumps there with one sync
+        carved = Grid(graph.rows, graph.cols)
+        carved_count = 0
+
+        def seek(k):
+            nonlocal carved_count
+            if k < carved_count:
+                carved.reset()
+                carved_count = 0
+            for (prev_x, prev_y, direction), _ in action_steps[carved_count:k]:
+                carved.remove_wall(prev_x, prev_y, direction)
+            carved_count = k
+            graph.show_carved(carved.walls)
+            if k:
+                move_pac_man(action_steps[k - 1])
+
+        def play_carve(action):
+            lines = carve(action)
+            if lines:
+                self.play(*[FadeOut(line) for line in lines], run_time=0.1)
+            else:
+                self.wait(0.1)
+
+        self.play_steps(maze_display, action_steps, play_carve, carve, seek if graph.syncs_walls else None)
 
         self.wait(2)
         self.play(FadeOut(pac_man), run_time=1)
         self.wait(2)
 
+    def solution(self):
         # A* Animation
-        graph.A_star(end_x=graph.rows - 1, end_y=graph.cols - 1)
-        solution_steps = graph.get_solution_steps()
-        solution_steps_VGroup = VGroup()
-        for step in solution_steps:
-            x, y, dis, _ = step
-            dis_tex = Tex(str(dis)).set_color(white).scale(0.8).move_to(graph.maze[x][y].get_center())
-            solution_steps_VGroup.add(dis_tex)
-            self.play(Create(dis_tex), run_time=0.1)
+        solution_steps_VGroup = self.solution_steps_VGroup = self.distance_labels()
+        if self.graph.marks_in_place:
+            def visit(step):
+                self.follow(self.graph.cell_center(*step[:2]))
+                return self.visit(step)
+
+            self.play_steps(self.maze_display, self.graph.get_solution_steps(),
+                            lambda step: (visit(step), self.wait(0.1)), visit)
+            self.wait(2)
+            return
+        if self.STEPS_PER_FRAME or self.DURATION:
+            # the labels start hidden and are revealed one step at a time
+            solution_steps_VGroup.set_opacity(0)
+            self.add(solution_steps_VGroup)
+        self.play_steps(solution_steps_VGroup, solution_steps_VGroup.submobjects,
+                        lambda dis_tex: self.play(Create(dis_tex.set_opacity(1)), run_time=0.1),
+                        lambda dis_tex: dis_tex.set_opacity(1))
 
         self.wait(2)
 
+    def trace_back(self):
+        SIZE, graph = self.SIZE, self.graph
         # Trace Back Animation
-        graph.maze[-1][-1].square.set_color(orange)
-        red_ghost = Figure(0.25 * SIZE, "images\\red_ghost.png").move_to(graph.maze[0][0].get_center())
+        graph.mark_cell(*graph.goal, orange)
+        red_ghost = Figure(0.25 * SIZE, "images\\red_ghost.png").move_to(graph.cell_center(0, 0))
         self.add(red_ghost)
         trace_back_steps = graph.get_trace_back_steps()
-        for step in trace_back_steps[::-1]:
+
+        def trace(step):
             x, y = step
-            graph.maze[x][y].square.set_color(red)
-            red_ghost.move_to(graph.maze[x][y].get_center())
-            self.play(graph.maze[x][y].square.animate.scale(0.8), run_time=0.1)
+            red_ghost.move_to(graph.cell_center(x, y))
+            self.follow(red_ghost.get_center())
+            return graph.mark_cell(x, y, red, inset=0.1)
+
+        if graph.marks_in_place:
+            # nothing to shrink, the raster insets the path and the viewport recolours it
+            self.play_steps(self.maze_display, trace_back_steps[::-1],
+                            lambda step: (trace(step), self.wait(0.1)), trace)
+        else:
+            self.play_steps(self.maze_display, trace_back_steps[::-1],
+                            lambda step: self.play(trace(step).animate.scale(0.8), run_time=0.1),
+                            lambda step: trace(step).scale(0.8))
 
         self.wait(2)
-        self.play(FadeOut(maze_display), FadeOut(solution_steps_VGroup), FadeOut(red_ghost), run_time=2)
+        self.play(FadeOut(self.maze_display), FadeOut(self.solution_steps_VGroup), FadeOut(red_ghost), run_time=2)
         self.wait(2)
 
+    def code(self):
         # Code Animation
         full_code = '''
         def recursive_backtracker(self):
@@ -304,3 +574,32 @@ class Test(Scene):
 
         self.play(FadeOut(rendered_code), FadeOut(maze_generation_VGroup), FadeOut(maze_solution_VGroup), run_time=2)
         self.wait(2)
+
+
+class Follow(Test, MovingCameraScene):
+    """A maze much bigger than the frame, the camera follows Pac-Man, the search and the ghost."""
+    ROWS, COLS = 60, 100
+    DISPLAY = "viewport"
+    DURATION = 30
+
+    def follow(self, point):
+        self.camera.frame.move_to(point)
+        if self.graph.viewport is not None:
+            self.graph.viewport.follow(point)
+
+    def play_steps(self, mobject, steps, play_step, apply_step, seek=None):
+        # the camera moves inside replayed and seeked steps too, it has to be part of what moves to be redrawn
+        super().play_steps(Group(mobject, self.camera.frame), steps, play_step, apply_step, seek)
+
+    def carved_maze(self):
+        super().carved_maze()
+        self.follow(self.graph.cell_center(*self.graph.get_action_steps()[-1][0][:2]))
+
+    def searched_maze(self):
+        super().searched_maze()
+        self.follow(self.graph.cell_center(*self.graph.get_solution_steps()[-1][:2]))
+
+    def trace_back(self):
+        super().trace_back()
+        # everything has faded out, the code segment is laid out around the origin
+        self.camera.frame.move_to(ORIGIN)
@@ -0,0 +1,150 @@
+"""Maze generators that yield carve events lazily.
+
+Every generator yields ``((prev_x, prev_y, direction), (cur_x, cur_y, reverse_direction))``, the format of
+``Maze.action_steps``: remove the wall of ``prev`` facing ``direction`` and the matching wall of ``cur``.
+Nothing is carved on a grid here, consumers apply the events themselves.
+"""
+import random
+
+import numpy as np
+
+from grid import OFFSET, OFFSET_REVERSE
+
+
+def _carve(prev_x, prev_y, direction):
+    offset_x, offset_y = OFFSET[direction]
+    return (prev_x, prev_y, direction), (prev_x + offset_x, prev_y + offset_y, OFFSET_REVERSE[direction])
+
+
+def recursive_backtracker(rows: int, cols: int, rng=random, visited=None):
+    """Randomized depth first search, same carve order as the original ``Maze.recursive_backtracker``.
+
+    The explicit stack can hold O(rows x cols) entries.
+    """
+    if visited is None:
+        visited = np.zeros((rows, cols), dtype=bool)
+    seen = memoryview(visited.reshape(-1))
+    st = [(0, 0, None)]
+    seen[0] = True
+
+    while st:
+        cur_x, cur_y, prev_direction = st.pop()
+        if prev_direction:
+            yield _carve(cur_x - OFFSET[prev_direction][0], cur_y - OFFSET[prev_direction][1], prev_direction)
+
+        available_neighbors = []
+        for direction, (offset_x, offset_y) in OFFSET.items():
+            next_x, next_y = cur_x + offset_x, cur_y + offset_y
+            if 0 <= next_x < rows and 0 <= next_y < cols and not seen[next_x * cols + next_y]:
+                available_neighbors.append((next_x, next_y, direction))
+        rng.shuffle(available_neighbors)
+        for next_x, next_y, direction in available_neighbors:
+            seen[next_x * cols + next_y] = True
+            st.append((next_x, next_y, direction))
+
+
+def kruskal(rows: int, cols: int, rng=random):
+    """Randomized Kruskal: walls in random order, carved when they join two components (union-find)."""
+    edges = [(x, y, "Right") for x in range(rows) for y in range(cols - 1)]
+    edges += [(x, y, "Down") for x in range(rows - 1) for y in range(cols)]
+    rng.shuffle(edges)
+    parent = memoryview(np.arange(rows * cols, dtype=np.int32))
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    remaining = rows * cols - 1
+    for x, y, direction in edges:
+        if not remaining:
+            return
+        offset_x, offset_y = OFFSET[direction]
+        a, b = find(x * cols + y), find((x + offset_x) * cols + y + offset_y)
+        if a != b:
+            parent[a] = b
+            remaining -= 1
+            yield _carve(x, y, direction)
+
+
+def wilson(rows: int, cols: int, rng=random):
+    """Wilson's algorithm: loop-erased random walks, a uniformly random spanning tree."""
+    in_tree = memoryview(np.zeros(rows * cols, dtype=bool))
+    # last direction taken out of each cell during the current walk, overwriting it erases loops
+    exit_direction = [None] * (rows * cols)
+    directions = list(OFFSET)
+    in_tree[rng.randrange(rows * cols)] = True
+
+    for start in range(rows * cols):
+        if in_tree[start]:
+            continue
+        cur = start
+        while not in_tree[cur]:
+            x, y = divmod(cur, cols)
+            while True:
+                direction = rng.choice(directions)
+                next_x, next_y = x + OFFSET[direction][0], y + OFFSET[direction][1]
+                if 0 <= next_x < rows and 0 <= next_y < cols:
+                    break
+            exit_direction[cur] = direction
+            cur = next_x * cols + next_y
+
+        cur = start
+        while not in_tree[cur]:
+            in_tree[cur] = True
+            x, y = divmod(cur, cols)
+            direction = exit_direction[cur]
+            yield _carve(x, y, direction)
+            cur = (x + OFFSET[direction][0]) * cols + y + OFFSET[direction][1]
+
+
+def eller(rows: int, cols: int, rng=random):
+    """Eller's algorithm, one row at a time in O(cols) memory.
+
+    Only the set labels of the current row are kept, so ``rows`` can be arbitrarily large and the
+    events can be streamed straight to rendering or to a trace file.
+    """
+    labels = [None] * cols
+    next_label = 0
+    for x in range(rows):
+        last_row = x == rows - 1
+        members = {}
+        for y in range(cols):
+            if labels[y] is None:
+                labels[y] = next_label
+                next_label += 1
+            members.setdefault(labels[y], []).append(y)
+
+        # join neighbours in different sets, the last row joins all of them
+        for y in range(cols - 1):
+            a, b = labels[y], labels[y + 1]
+            if a != b and (last_row or rng.random() < 0.5):
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for member in members[b]:
+                    labels[member] = a
+                members[a] += members.pop(b)
+                yield _carve(x, y, "Right")
+        if last_row:
+            return
+
+        # every set carries on into the next row through at least one downward passage
+        below = [None] * cols
+        for label, group in members.items():
+            rng.shuffle(group)
+            for k, y in enumerate(group):
+                if k == 0 or rng.random() < 0.5:
+                    below[y] = label
+        for y in range(cols):
+            if below[y] is not None:
+                yield _carve(x, y, "Down")
+        labels = below
+
+
+GENERATORS = {
+    "recursive_backtracker": recursive_backtracker,
+    "kruskal": kruskal,
+    "wilson": wilson,
+    "eller": eller,
+}
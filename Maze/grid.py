@@ -0,0 +1,79 @@
+import numpy as np
+
+TOP, RIGHT, DOWN, LEFT = 1, 2, 4, 8
+ALL_WALLS = TOP | RIGHT | DOWN | LEFT
+
+# same iteration order as Maze.offset, so seeded shuffles stay reproducible
+OFFSET = {"Right": (0, 1), "Down": (1, 0), "Left": (0, -1), "Top": (-1, 0)}
+OFFSET_REVERSE = {"Right": "Left", "Down": "Top", "Left": "Right", "Top": "Down"}
+WALL_BIT = {"Top": TOP, "Right": RIGHT, "Down": DOWN, "Left": LEFT}
+
+
+class Grid:
+    """Headless maze state: one wall bitmask per cell plus visited and parent arrays."""
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+        self.walls = np.full((rows, cols), ALL_WALLS, dtype=np.uint8)
+        self.visited = np.zeros((rows, cols), dtype=bool)
+        # flat index (x * cols + y) of the previous cell on the search tree, -1 for none
+        self.parent = np.full((rows, cols), -1, dtype=np.int32)
+        # flat views for the hot loops, numpy scalar indexing is several times slower
+        self._walls = memoryview(self.walls.reshape(-1))
+        self._visited = memoryview(self.visited.reshape(-1))
+        self._parent = memoryview(self.parent.reshape(-1))
+
+    def in_bounds(self, x: int, y: int):
+        return 0 <= x < self.rows and 0 <= y < self.cols
+
+    def has_wall(self, x: int, y: int, direction: str):
+        return bool(self._walls[x * self.cols + y] & WALL_BIT[direction])
+
+    def remove_wall(self, x: int, y: int, direction: str):
+        next_x, next_y = x + OFFSET[direction][0], y + OFFSET[direction][1]
+        self._walls[x * self.cols + y] &= ~WALL_BIT[direction] & ALL_WALLS
+        self._walls[next_x * self.cols + next_y] &= ~WALL_BIT[OFFSET_REVERSE[direction]] & ALL_WALLS
+        return next_x, next_y
+
+    def neighbors(self, x: int, y: int):
+        for direction, (offset_x, offset_y) in OFFSET.items():
+            next_x, next_y = x + offset_x, y + offset_y
+            if 0 <= next_x < self.rows and 0 <= next_y < self.cols:
+                yield next_x, next_y, direction
+
+    def open_neighbors(self, x: int, y: int):
+        mask = self._walls[x * self.cols + y]
+        for next_x, next_y, direction in self.neighbors(x, y):
+            if not mask & WALL_BIT[direction]:
+                yield next_x, next_y, direction
+
+    def is_visited(self, x: int, y: int):
+        return self._visited[x * self.cols + y]
+
+    def mark_visited(self, x: int, y: int):
+        self._visited[x * self.cols + y] = True
+
+    def set_prev_cell(self, x: int, y: int, prev_cell):
+        self._parent[x * self.cols + y] = -1 if prev_cell is None else prev_cell[0] * self.cols + prev_cell[1]
+
+    def prev_cell(self, x: int, y: int):
+        index = self._parent[x * self.cols + y]
+        if index < 0:
+            return None
+        return divmod(index, self.cols)
+
+    def reset(self):
+        """Every wall standing, nothing visited, no parents."""
+        self.walls.fill(ALL_WALLS)
+        self.reset_visited()
+        self.reset_parent()
+
+    def reset_visited(self):
+        self.visited.fill(False)
+
+    def reset_parent(self):
+        self.parent.fill(-1)
+
+    def nbytes(self):
+        return self.walls.nbytes + self.visited.nbytes + self.parent.nbytes
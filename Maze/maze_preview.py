@@ -0,0 +1,139 @@
+"""Preview the maze scene from its step traces without manim: carving, search and trace back as GIF or MP4.
+
+    python maze_preview.py maze.mp4 --rows 12 --cols 20 --seed 4843
+    python maze_preview.py maze.gif --trace maze_trace.mzt --steps-per-frame 10
+
+Walls, visited cells and the path are drawn like ``Test`` with ``DISPLAY = "raster"``; Pac-Man and the
+ghost are squares in their colours.
+"""
+import argparse
+import random
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.palette import BACKGROUND, red, orange, yellow, purple, white
+from common.preview import Canvas, FrameWriter
+
+from generators import GENERATORS
+from grid import Grid
+from raster import RasterMaze
+from search import ALGORITHMS, search
+from trace_file import read_trace
+
+
+def maze_steps(rows: int, cols: int, seed=4843, generator="recursive_backtracker", algorithm="a_star"):
+    """action_steps, solution_steps and trace_back_steps exactly as ``Test.setup`` computes them."""
+    grid = Grid(rows, cols)
+    action_steps = list(GENERATORS[generator](rows, cols, random.Random(seed)))
+    for (prev_x, prev_y, direction), _ in action_steps:
+        grid.remove_wall(prev_x, prev_y, direction)
+    goal = (rows - 1, cols - 1)
+    solution_steps = search(grid, (0, 0), goal, algorithm=algorithm).solution_steps
+    trace_back_steps, prev_cell = [], goal
+    while prev_cell:
+        trace_back_steps.append(prev_cell)
+        prev_cell = grid.prev_cell(*prev_cell)
+    return action_steps, solution_steps, trace_back_steps
+
+
+class MazePreview:
+    """A RasterMaze drawn straight into the canvas frame, so a step costs a few pixels and a frame one write.
+
+    Mazes too big for the frame at ``size`` units per cell are drawn into their own buffer and the visible
+    part copied in every frame.
+    """
+
+    def __init__(self, output, rows: int, cols: int, size: float = 0.6, frame_rate: float = 10,
+                 steps_per_frame: int = 1, resolution=(854, 480)):
+        self.rows, self.cols, self.size = rows, cols, size
+        self.frame_rate = frame_rate
+        self.steps_per_frame = steps_per_frame
+        self.canvas = Canvas(*resolution, background=BACKGROUND)
+        cell_pixels = max(2, round(size * self.canvas.unit))
+        # manim's default stroke is about 0.04 units wide
+        wall_pixels = max(1, min(cell_pixels - 1, round(0.04 * self.canvas.unit)))
+        shape = (rows * cell_pixels + wall_pixels, cols * cell_pixels + wall_pixels)
+        self.window, self.visible = self.canvas.place(0, 0, *shape)
+        self.direct = all(part.stop - part.start == length for part, length in zip(self.visible, shape))
+        self.raster = RasterMaze(rows, cols, cell_pixels, wall_pixels, cell_color=BACKGROUND, wall_color=white,
+                                 pixels=self.canvas.frame[self.window] if self.direct else None)
+        self.writer = FrameWriter(output, *resolution, frame_rate)
+
+    def cell_center(self, x, y):
+        return (y - (self.cols - 1) / 2) * self.size, ((self.rows - 1) / 2 - x) * self.size
+
+    def frame(self, figure=None, seconds=None):
+        """Write the current state, with ``figure`` = (cell, colour) on top, once or for ``seconds``."""
+        canvas = self.canvas
+        if not self.direct:
+            canvas.frame[self.window] = self.raster.pixels[self.visible]
+        saved = None
+        if figure is not None:
+            (x, y), color = figure
+            box = canvas.box(*self.cell_center(x, y), self.size * 0.6, self.size * 0.6)
+            saved = box, canvas.frame[box].copy()
+            canvas.rect(*self.cell_center(x, y), self.size * 0.6, self.size * 0.6, color)
+        self.writer.write(canvas.frame, 1 if seconds is None else max(1, round(seconds * self.frame_rate)))
+        if saved is not None:
+            canvas.frame[saved[0]] = saved[1]
+
+    def steps(self, steps, apply_step, figure=None):
+        """Apply the steps, writing a frame every ``steps_per_frame`` of them."""
+        for i, step in enumerate(steps, 1):
+            apply_step(step)
+            if i % self.steps_per_frame == 0 or i == len(steps):
+                self.frame(figure and figure(step))
+
+    def play(self, action_steps, solution_steps, trace_back_steps, goal=None):
+        raster = self.raster
+        goal = goal or (self.rows - 1, self.cols - 1)
+        # generation
+        self.frame(seconds=min(self.rows * self.cols * 0.025, 10) + 1)
+        pac_man = lambda action: (action[0][:2], yellow)
+        self.steps(action_steps, lambda action: raster.remove_wall(*action[0]), pac_man)
+        self.frame(pac_man(action_steps[-1]) if action_steps else None, seconds=2)
+        self.frame(seconds=3)
+        # solution, visited cells are coloured like the raster display does
+        self.steps(solution_steps, lambda step: raster.fill_cell(step[0], step[1], purple, 0.25))
+        self.frame(seconds=2)
+        # trace back
+        raster.fill_cell(*goal, orange)
+        red_ghost = lambda cell: (cell, red)
+        self.steps(trace_back_steps[::-1], lambda cell: raster.fill_cell(*cell, red, 0.1), red_ghost)
+        self.frame(red_ghost(trace_back_steps[0]) if trace_back_steps else None, seconds=4)
+        self.canvas.clear()
+        self.writer.write(self.canvas.frame, round(2 * self.frame_rate))
+        return self.writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help=".gif needs Pillow, anything else ffmpeg")
+    parser.add_argument("--rows", type=int, default=12)
+    parser.add_argument("--cols", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=4843)
+    parser.add_argument("--generator", choices=sorted(GENERATORS), default="recursive_backtracker")
+    parser.add_argument("--search", choices=sorted(ALGORITHMS), default="a_star")
+    parser.add_argument("--trace", default=None, help="a trace file written by Maze.save_trace instead")
+    parser.add_argument("--size", type=float, default=0.6, help="cell size in manim units")
+    parser.add_argument("--frame-rate", type=float, default=10)
+    parser.add_argument("--steps-per-frame", type=int, default=1)
+    parser.add_argument("--resolution", type=int, nargs=2, default=(854, 480), metavar=("WIDTH", "HEIGHT"))
+    args = parser.parse_args()
+
+    if args.trace:
+        trace = read_trace(args.trace)
+        rows, cols, goal = trace.meta["rows"], trace.meta["cols"], tuple(trace.meta["goal"])
+        # play() indexes and reverses the steps, the trace only yields them
+        steps = list(trace.action_steps()), list(trace.solution_steps()), list(trace.trace_back_steps())
+    else:
+        rows, cols, goal = args.rows, args.cols, None
+        steps = maze_steps(rows, cols, args.seed, args.generator, args.search)
+    preview = MazePreview(args.output, rows, cols, args.size, args.frame_rate, args.steps_per_frame,
+                          tuple(args.resolution))
+    print(preview.play(*steps, goal=goal), preview.writer.frames, "frames")
+
+
+if __name__ == "__main__":
+    main()
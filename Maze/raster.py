@@ -0,0 +1,117 @@
+import hashlib
+
+import numpy as np
+
+from common.palette import BACKGROUND, hex_to_rgba, white
+from grid import RIGHT, DOWN
+
+
+class RasterMaze:
+    """The maze drawn into one RGBA pixel buffer instead of one mobject per cell or wall.
+
+    Carving, visiting and path marking write pixels in place, so the per-step and per-frame cost does not
+    depend on the maze size. ``mobject()`` wraps the buffer in a single ImageMobject, which owns it from then
+    on. Cell (x, y) covers rows ``[x * cell_pixels, (x + 1) * cell_pixels + wall_pixels)`` of the buffer.
+    """
+
+    def __init__(self, rows: int, cols: int, cell_pixels: int = 8, wall_pixels: int = 1,
+                 cell_color=BACKGROUND, wall_color=white, pixels=None):
+        self.rows = rows
+        self.cols = cols
+        self.cell_pixels = cell_pixels
+        self.wall_pixels = wall_pixels
+        self.cell_color = np.array(hex_to_rgba(cell_color), dtype=np.uint8)
+        self.wall_color = np.array(hex_to_rgba(wall_color), dtype=np.uint8)
+        shape = (rows * cell_pixels + wall_pixels, cols * cell_pixels + wall_pixels, 4)
+        # an existing buffer (e.g. a view of a bigger frame) is drawn into in place
+        self._pixels = np.empty(shape, dtype=np.uint8) if pixels is None else pixels
+        if self._pixels.shape != shape:
+            raise ValueError(f"a {rows}x{cols} maze needs a {shape} pixel buffer, got {self._pixels.shape}")
+        self.image = None
+        self._digest = None
+        self.reset()
+
+    @property
+    def pixels(self):
+        # Transform based animations (FadeIn, ...) swap in a new pixel_array, always draw into the current one
+        return self._pixels if self.image is None else self.image.pixel_array
+
+    def _changed(self, change: bytes):
+        # manim hashes only the first 10k values of an image's pixels for its partial movie cache, a digest of
+        # every change since the last reset goes into that hash as an attribute of the image
+        self._digest.update(change)
+        if self.image is not None:
+            self.image.raster_digest = self._digest.hexdigest()
+
+    def reset(self):
+        """Every wall standing, every cell blank."""
+        self._digest = hashlib.blake2b(repr((self.pixels.shape, self.cell_pixels, self.cell_color.tolist(),
+                                             self.wall_color.tolist())).encode(), digest_size=16)
+        self._changed(b"reset")
+        step, wall = self.cell_pixels, self.wall_pixels
+        self.pixels[:] = self.cell_color
+        for i in range(self.rows + 1):
+            self.pixels[i * step:i * step + wall] = self.wall_color
+        for j in range(self.cols + 1):
+            self.pixels[:, j * step:j * step + wall] = self.wall_color
+
+    def cell_slices(self, x: int, y: int, inset: int = 0):
+        step, wall = self.cell_pixels, self.wall_pixels
+        return (slice(x * step + wall + inset, (x + 1) * step - inset),
+                slice(y * step + wall + inset, (y + 1) * step - inset))
+
+    def wall_slices(self, x: int, y: int, direction: str):
+        step, wall = self.cell_pixels, self.wall_pixels
+        rows, cols = self.cell_slices(x, y)
+        if direction == "Top":
+            return slice(x * step, x * step + wall), cols
+        if direction == "Down":
+            return slice((x + 1) * step, (x + 1) * step + wall), cols
+        if direction == "Left":
+            return rows, slice(y * step, y * step + wall)
+        return rows, slice((y + 1) * step, (y + 1) * step + wall)
+
+    def remove_wall(self, x: int, y: int, direction: str):
+        self._changed(f"remove_wall {x} {y} {direction}".encode())
+        self.pixels[self.wall_slices(x, y, direction)] = self.cell_color
+
+    def fill_cell(self, x: int, y: int, color, inset: float = 0):
+        """Paint cell (x, y), ``inset`` is the fraction of the cell left blank on each side."""
+        rgba = hex_to_rgba(color) if isinstance(color, str) else color
+        self._changed(f"fill_cell {x} {y} {tuple(rgba)} {inset}".encode())
+        self.pixels[self.cell_slices(x, y, round(inset * (self.cell_pixels - self.wall_pixels)))] = rgba
+
+    def sync(self, walls):
+        """Redraw every wall from a Grid wall bitmask array at once, e.g. to show an already carved maze."""
+        self.reset()
+        self._changed(np.ascontiguousarray(walls).tobytes())
+        step, wall = self.cell_pixels, self.wall_pixels
+        # the outer walls never open, so the last column (row) of blocks is left out
+        right = self._blocks(wall, step, self.rows, self.cols - 1)
+        right[(walls[:, :-1] & RIGHT) == 0, :step - wall, :wall] = self.cell_color
+        down = self._blocks(step, wall, self.rows - 1, self.cols)
+        down[(walls[:-1] & DOWN) == 0, :wall, :step - wall] = self.cell_color
+        return self
+
+    def _blocks(self, top: int, left: int, rows: int, cols: int):
+        # a (rows, cols, cell_pixels, cell_pixels, 4) view, block (x, y) starts at pixel
+        # (x * cell_pixels + top, y * cell_pixels + left)
+        step = self.cell_pixels
+        region = self.pixels[top:top + rows * step, left:left + cols * step]
+        return region.reshape(rows, step, cols, step, 4).swapaxes(1, 2)
+
+    def mobject(self, cell_size: float = 1):
+        """An ImageMobject showing this buffer, laid out like the Cell grid of the same cell_size.
+
+        The image keeps its own copy of the buffer, which animations may replace; ``pixels`` is always the
+        one it shows.
+        """
+        from manim import ImageMobject, RESAMPLING_ALGORITHMS
+
+        self.image = ImageMobject(self._pixels)
+        self.image.raster_digest = self._digest.hexdigest()
+        self.image.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        border = self.wall_pixels / self.cell_pixels * cell_size
+        self.image.stretch_to_fit_width(self.cols * cell_size + border)
+        self.image.stretch_to_fit_height(self.rows * cell_size + border)
+        return self.image
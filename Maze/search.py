@@ -0,0 +1,262 @@
+from collections import deque
+from heapq import heappop, heappush
+from time import perf_counter
+
+import numpy as np
+
+from grid import TOP, RIGHT, DOWN, LEFT
+
+
+class SearchResult:
+    """Outcome of one grid search.
+
+    ``solution_steps`` holds ``(x, y, dis, prev_cell)`` per expanded cell in expansion order,
+    the same shape ``Maze.get_solution_steps`` always had, so the scene can animate any algorithm.
+    """
+
+    def __init__(self, algorithm: str, start, goal):
+        self.algorithm = algorithm
+        self.start = start
+        self.goal = goal
+        self.path = []
+        self.solution_steps = []
+        self.expanded = 0
+        self.pushes = 0
+        self.pruned = 0
+        self.seconds = 0.0
+
+    @property
+    def found(self):
+        return bool(self.path)
+
+    def stats(self):
+        return {"algorithm": self.algorithm, "expanded": self.expanded, "pushes": self.pushes,
+                "pruned": self.pruned, "path_length": max(len(self.path) - 1, -1), "seconds": self.seconds}
+
+    def __repr__(self):
+        return f"SearchResult({', '.join(f'{k}={v!r}' for k, v in self.stats().items())})"
+
+
+def _moves(grid):
+    # (wall bit, flat index delta), in the order of grid.OFFSET
+    return ((RIGHT, 1), (DOWN, grid.cols), (LEFT, -1), (TOP, -grid.cols))
+
+
+def _manhattan(cols, target):
+    target_x, target_y = divmod(target, cols)
+
+    def h(index):
+        x, y = divmod(index, cols)
+        return abs(x - target_x) + abs(y - target_y)
+
+    return h
+
+
+def _step(grid, index, dis, prev):
+    x, y = divmod(index, grid.cols)
+    return x, y, dis, None if prev < 0 else divmod(prev, grid.cols)
+
+
+def _path(grid, goal):
+    parent = memoryview(grid.parent.reshape(-1))
+    path, index = [], goal
+    while index >= 0:
+        path.append(divmod(index, grid.cols))
+        index = parent[index]
+    return path[::-1]
+
+
+def prune_dead_ends(grid, start, goal):
+    """Mask of cells that can't lie on a start-goal path, found by repeatedly cutting off dead ends.
+
+    In a perfect maze only the start-goal path survives.
+    """
+    walls = grid.walls.reshape(-1)
+    open_count = 4 - np.unpackbits(walls[:, None], axis=1)[:, 4:].sum(axis=1)
+    degree = memoryview(open_count.astype(np.int32))
+    wall_view = memoryview(walls)
+    pruned = np.zeros(grid.rows * grid.cols, dtype=bool)
+    pruned_view = memoryview(pruned)
+    keep = {start[0] * grid.cols + start[1], goal[0] * grid.cols + goal[1]}
+    moves = _moves(grid)
+
+    queue = deque(int(i) for i in np.flatnonzero(open_count <= 1) if i not in keep)
+    while queue:
+        index = queue.pop()
+        if pruned_view[index]:
+            continue
+        pruned_view[index] = True
+        mask = wall_view[index]
+        for bit, delta in moves:
+            if not mask & bit:
+                neighbor = index + delta
+                if not pruned_view[neighbor]:
+                    degree[neighbor] -= 1
+                    if degree[neighbor] <= 1 and neighbor not in keep:
+                        queue.append(neighbor)
+    return pruned.reshape(grid.rows, grid.cols)
+
+
+def _best_first(grid, start, goal, result, heuristic, blocked):
+    cols = grid.cols
+    walls = memoryview(grid.walls.reshape(-1))
+    parent = memoryview(grid.parent.reshape(-1))
+    dist = np.full(grid.rows * cols, np.iinfo(np.int32).max, dtype=np.int32)
+    dist_view = memoryview(dist)
+    closed = memoryview(np.zeros(grid.rows * cols, dtype=bool) if blocked is None else blocked.copy())
+    moves = _moves(grid)
+
+    dist_view[start] = 0
+    # (f, h, index), stale entries are skipped when popped instead of being removed from the heap
+    pq = [(heuristic(start), heuristic(start), start)]
+    result.pushes += 1
+    while pq:
+        _, _, cur = heappop(pq)
+        if closed[cur]:
+            continue
+        closed[cur] = True
+        cur_dis = dist_view[cur]
+        result.expanded += 1
+        result.solution_steps.append(_step(grid, cur, cur_dis, parent[cur]))
+        if cur == goal:
+            return True
+        mask = walls[cur]
+        for bit, delta in moves:
+            if mask & bit:
+                continue
+            nxt = cur + delta
+            if closed[nxt] or dist_view[nxt] <= cur_dis + 1:
+                continue
+            dist_view[nxt] = cur_dis + 1
+            parent[nxt] = cur
+            h = heuristic(nxt)
+            heappush(pq, (cur_dis + 1 + h, h, nxt))
+            result.pushes += 1
+    return False
+
+
+def a_star(grid, start, goal, result, blocked=None):
+    return _best_first(grid, start, goal, result, _manhattan(grid.cols, goal), blocked)
+
+
+def dijkstra(grid, start, goal, result, blocked=None):
+    return _best_first(grid, start, goal, result, lambda index: 0, blocked)
+
+
+def bfs(grid, start, goal, result, blocked=None):
+    walls = memoryview(grid.walls.reshape(-1))
+    parent = memoryview(grid.parent.reshape(-1))
+    seen = memoryview(np.zeros(grid.rows * grid.cols, dtype=bool) if blocked is None else blocked.copy())
+    moves = _moves(grid)
+
+    queue = deque([(start, 0)])
+    seen[start] = True
+    result.pushes += 1
+    while queue:
+        cur, cur_dis = queue.popleft()
+        result.expanded += 1
+        result.solution_steps.append(_step(grid, cur, cur_dis, parent[cur]))
+        if cur == goal:
+            return True
+        mask = walls[cur]
+        for bit, delta in moves:
+            nxt = cur + delta
+            if not mask & bit and not seen[nxt]:
+                seen[nxt] = True
+                parent[nxt] = cur
+                queue.append((nxt, cur_dis + 1))
+                result.pushes += 1
+    return False
+
+
+def bidirectional_a_star(grid, start, goal, result, blocked=None):
+    """A* from both ends, stopping once neither frontier can beat the best meeting point.
+
+    Expansions from the goal side report their distance to the goal. On success ``grid.parent``
+    is rewritten along the goal half, so tracing back from the goal still leads to the start.
+    """
+    size = grid.rows * grid.cols
+    walls = memoryview(grid.walls.reshape(-1))
+    blocked = np.zeros(size, dtype=bool) if blocked is None else blocked
+    moves = _moves(grid)
+    infinity = np.iinfo(np.int32).max
+
+    parents = (memoryview(grid.parent.reshape(-1)), memoryview(np.full(size, -1, dtype=np.int32)))
+    dists = (memoryview(np.full(size, infinity, dtype=np.int32)), memoryview(np.full(size, infinity, dtype=np.int32)))
+    closed = (memoryview(blocked.copy()), memoryview(blocked.copy()))
+    heuristics = (_manhattan(grid.cols, goal), _manhattan(grid.cols, start))
+    queues = ([(heuristics[0](start), start)], [(heuristics[1](goal), goal)])
+    dists[0][start], dists[1][goal] = 0, 0
+    result.pushes += 2
+
+    best, meet = infinity, None
+    if start == goal:
+        best, meet = 0, (start, start)
+    while queues[0] and queues[1] and max(queues[0][0][0], queues[1][0][0]) < best:
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        parent, dist, done, h = parents[side], dists[side], closed[side], heuristics[side]
+        other_dist = dists[1 - side]
+        _, cur = heappop(queues[side])
+        if done[cur]:
+            continue
+        done[cur] = True
+        cur_dis = dist[cur]
+        result.expanded += 1
+        result.solution_steps.append(_step(grid, cur, cur_dis, parent[cur]))
+        mask = walls[cur]
+        for bit, delta in moves:
+            if mask & bit:
+                continue
+            nxt = cur + delta
+            if done[nxt]:
+                continue
+            if dist[nxt] > cur_dis + 1:
+                dist[nxt] = cur_dis + 1
+                parent[nxt] = cur
+                heappush(queues[side], (cur_dis + 1 + h(nxt), nxt))
+                result.pushes += 1
+            if other_dist[nxt] != infinity and cur_dis + 1 + other_dist[nxt] < best:
+                best = cur_dis + 1 + other_dist[nxt]
+                meet = (cur, nxt) if side == 0 else (nxt, cur)
+
+    if meet is None:
+        return False
+    # hang the goal half of the path below the meeting edge
+    forward, backward = parents
+    prev, cur = meet
+    if prev != cur:
+        forward[cur] = prev
+    while cur != goal:
+        prev, cur = cur, backward[cur]
+        forward[cur] = prev
+    return True
+
+
+ALGORITHMS = {
+    "a_star": a_star,
+    "bfs": bfs,
+    "dijkstra": dijkstra,
+    "bidirectional_a_star": bidirectional_a_star,
+}
+
+
+def search(grid, start, goal, algorithm: str = "a_star", prune: bool = False):
+    """Run one of ``ALGORITHMS`` from ``start`` to ``goal`` (both ``(x, y)``) and return a SearchResult.
+
+    ``prune`` first cuts off dead ends with ``prune_dead_ends``; the pruning time is included.
+    ``grid.parent`` is overwritten with the search tree.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown search algorithm {algorithm!r}, expected one of {sorted(ALGORITHMS)}")
+    result = SearchResult(algorithm, start, goal)
+    begin = perf_counter()
+    grid.reset_parent()
+    blocked = None
+    if prune:
+        blocked = prune_dead_ends(grid, start, goal).reshape(-1)
+        result.pruned = int(blocked.sum())
+    start_index, goal_index = start[0] * grid.cols + start[1], goal[0] * grid.cols + goal[1]
+    if ALGORITHMS[algorithm](grid, start_index, goal_index, result, blocked):
+        result.path = _path(grid, goal_index)
+    result.seconds = perf_counter() - begin
+    return result
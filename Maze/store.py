@@ -0,0 +1,62 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from common.source import code_digest
+
+import generators
+import grid
+import search
+from trace_file import VERSION
+
+
+class MazeStore:
+    """Carved and searched mazes on disk, addressed by a digest of the parameters that produced them.
+
+    ``params`` must name everything the maze and its traces depend on (size, seed, generator, search); the
+    key also covers the source of the grid, generator and search modules and of the Maze class, so changing
+    that code starts new entries instead of returning stale ones. Entries are trace files written by
+    ``Maze.save_trace``; ``root`` defaults to ``<media_dir>/maze_store``.
+    """
+
+    def __init__(self, root=None):
+        self._root = root
+
+    @property
+    def root(self):
+        if self._root is None:
+            from manim import config
+
+            # resolved lazily, the media_dir is only final once manim has parsed its command line
+            self._root = Path(config.media_dir) / "maze_store"
+        path = Path(self._root)
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    @staticmethod
+    def key(maze, params):
+        code = code_digest(grid, generators, search, type(maze))
+        return hashlib.sha256(json.dumps([params, VERSION, code], sort_keys=True).encode()).hexdigest()
+
+    def path(self, maze, params):
+        return self.root / f"{self.key(maze, params)}.mzt"
+
+    def load(self, maze, params):
+        """Fill ``maze`` from the store, False when there is no (readable) entry for ``params``."""
+        path = self.path(maze, params)
+        if not path.exists():
+            return False
+        try:
+            maze.load_trace(path)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def save(self, maze, params):
+        path = self.path(maze, params)
+        # segments rendered in parallel may save the same entry at once
+        partial = path.with_name(f"{path.name}.{os.getpid()}.partial")
+        maze.save_trace(partial)
+        os.replace(partial, path)
+        return path
@@ -0,0 +1,41 @@
+import hashlib
+import sys
+
+import maze_preview
+from trace_file import write_trace
+
+
+class FrameRecorder:
+    """Stands in for FrameWriter, which needs Pillow or ffmpeg: keeps a digest of every frame written."""
+
+    writers = []
+
+    def __init__(self, path, width, height, frame_rate=10):
+        self.path = path
+        self.frames = 0
+        self.digests = []
+        self.writers.append(self)
+
+    def write(self, frame, repeat=1):
+        self.frames += repeat
+        self.digests.append((hashlib.sha256(frame.tobytes()).hexdigest(), repeat))
+
+    def close(self):
+        return self.path
+
+
+def test_main_with_trace(tmp_path, monkeypatch):
+    rows, cols = 6, 9
+    steps = maze_preview.maze_steps(rows, cols, seed=7)
+    trace = tmp_path / "maze_trace.mzt"
+    write_trace(trace, *steps, meta={"rows": rows, "cols": cols, "goal": [rows - 1, cols - 1]})
+    monkeypatch.setattr(maze_preview, "FrameWriter", FrameRecorder)
+    monkeypatch.setattr(FrameRecorder, "writers", [])
+    monkeypatch.setattr(sys, "argv", ["maze_preview.py", str(tmp_path / "maze.gif"), "--trace", str(trace),
+                                      "--steps-per-frame", "4"])
+    maze_preview.main()
+    maze_preview.MazePreview(tmp_path / "steps.gif", rows, cols, steps_per_frame=4).play(*steps)
+
+    from_trace, from_steps = FrameRecorder.writers
+    assert from_trace.frames > 0
+    assert from_trace.digests == from_steps.digests
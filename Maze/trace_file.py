@@ -0,0 +1,179 @@
+"""Binary trace files for action_steps, solution_steps and trace_back_steps.
+
+Layout, all little endian::
+
+    magic (8 bytes) | version (u4) | reserved (u4) | footer offset (u8)
+    section data, each section 64-byte aligned and stored as a fixed-width structured array
+    footer: UTF-8 JSON {"meta": {...}, "sections": {name: {"offset", "count", "dtype"}}}
+
+The footer comes last so sections can be written in bulk chunks without knowing their length up front,
+and every section can be opened with ``np.memmap`` without copying.
+"""
+import json
+import struct
+
+import numpy as np
+
+from grid import OFFSET, OFFSET_REVERSE
+
+MAGIC = b"MAZETRC\0"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIQ")
+_ALIGN = 64
+
+DIRECTIONS = tuple(OFFSET)
+DIRECTION_CODE = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+# only the first side of a carve is stored, the other one follows from the direction
+ACTION_DTYPE = np.dtype([("x", "<i4"), ("y", "<i4"), ("direction", "u1")])
+# prev_x = prev_y = -1 for the start cell
+SOLUTION_DTYPE = np.dtype([("x", "<i4"), ("y", "<i4"), ("dis", "<i4"), ("prev_x", "<i4"), ("prev_y", "<i4")])
+TRACE_BACK_DTYPE = np.dtype([("x", "<i4"), ("y", "<i4")])
+
+
+def actions_to_array(action_steps):
+    return np.fromiter(((x, y, DIRECTION_CODE[direction]) for (x, y, direction), _ in action_steps),
+                       dtype=ACTION_DTYPE)
+
+
+def solutions_to_array(solution_steps):
+    return np.fromiter(((x, y, dis) + ((-1, -1) if prev is None else tuple(prev))
+                        for x, y, dis, prev in solution_steps), dtype=SOLUTION_DTYPE)
+
+
+def trace_back_to_array(trace_back_steps):
+    return np.fromiter((tuple(step) for step in trace_back_steps), dtype=TRACE_BACK_DTYPE)
+
+
+def iter_rows(array, chunk_size: int = 1 << 16):
+    """The records of ``array`` as tuples, converted ``chunk_size`` at a time so a memmap stays lazy."""
+    for start in range(0, len(array), chunk_size):
+        yield from array[start:start + chunk_size].tolist()
+
+
+def iter_actions(array):
+    for x, y, code in iter_rows(array):
+        direction = DIRECTIONS[code]
+        offset_x, offset_y = OFFSET[direction]
+        yield (x, y, direction), (x + offset_x, y + offset_y, OFFSET_REVERSE[direction])
+
+
+def iter_solutions(array):
+    for x, y, dis, prev_x, prev_y in iter_rows(array):
+        yield x, y, dis, None if prev_x < 0 else (prev_x, prev_y)
+
+
+def iter_trace_back(array):
+    for x, y in iter_rows(array):
+        yield x, y
+
+
+class TraceWriter:
+    """Writes sections one after another; ``write`` may be called repeatedly to append chunks to a section."""
+
+    def __init__(self, path, meta=None):
+        self.path = path
+        self.meta = dict(meta or {})
+        self.sections = {}
+        self.current = None
+        self.file = open(path, "wb")
+        self.file.write(_HEADER.pack(MAGIC, VERSION, 0, 0))
+
+    def write(self, name: str, array):
+        array = np.ascontiguousarray(array)
+        if name != self.current:
+            if name in self.sections:
+                raise ValueError(f"section {name!r} was already closed by writing another section")
+            self.file.write(b"\0" * (-self.file.tell() % _ALIGN))
+            self.sections[name] = {"offset": self.file.tell(), "count": 0, "dtype": array.dtype.descr}
+            self.current = name
+        elif array.dtype.descr != self.sections[name]["dtype"]:
+            raise ValueError(f"section {name!r} is {self.sections[name]['dtype']}, got {array.dtype.descr}")
+        self.file.write(array.tobytes())
+        self.sections[name]["count"] += len(array)
+
+    def write_chunks(self, name: str, steps, to_array, chunk_size: int = 1 << 16):
+        """Bulk-write a lazy step stream (e.g. a generator from generators.py) without building a list."""
+        chunk = []
+        for step in steps:
+            chunk.append(step)
+            if len(chunk) == chunk_size:
+                self.write(name, to_array(chunk))
+                chunk.clear()
+        if chunk or name not in self.sections:
+            self.write(name, to_array(chunk))
+
+    def close(self):
+        if self.file.closed:
+            return
+        footer_offset = self.file.tell()
+        self.file.write(json.dumps({"meta": self.meta, "sections": self.sections}).encode())
+        self.file.seek(0)
+        self.file.write(_HEADER.pack(MAGIC, VERSION, 0, footer_offset))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Trace:
+    """A trace file opened for reading, sections are ``np.memmap`` views unless ``mmap=False``."""
+
+    def __init__(self, path, mmap: bool = True):
+        with open(path, "rb") as f:
+            magic, version, _, footer_offset = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a maze trace file")
+            if version > VERSION:
+                raise ValueError(f"{path} is trace version {version}, this reader supports up to {VERSION}")
+            f.seek(footer_offset)
+            footer = json.loads(f.read())
+        self.path = path
+        self.version = version
+        self.meta = footer["meta"]
+        self.sections = {}
+        for name, section in footer["sections"].items():
+            dtype = np.dtype([tuple(field) for field in section["dtype"]])
+            if not section["count"]:
+                self.sections[name] = np.empty(0, dtype=dtype)
+            elif mmap:
+                self.sections[name] = np.memmap(path, dtype=dtype, mode="r", offset=section["offset"],
+                                                shape=(section["count"],))
+            else:
+                self.sections[name] = np.fromfile(path, dtype=dtype, count=section["count"],
+                                                  offset=section["offset"])
+
+    def __getitem__(self, name: str):
+        return self.sections[name]
+
+    def __contains__(self, name: str):
+        return name in self.sections
+
+    def action_steps(self):
+        return iter_actions(self.sections.get("action_steps", np.empty(0, dtype=ACTION_DTYPE)))
+
+    def solution_steps(self):
+        return iter_solutions(self.sections.get("solution_steps", np.empty(0, dtype=SOLUTION_DTYPE)))
+
+    def trace_back_steps(self):
+        return iter_trace_back(self.sections.get("trace_back_steps", np.empty(0, dtype=TRACE_BACK_DTYPE)))
+
+
+def write_trace(path, action_steps=None, solution_steps=None, trace_back_steps=None, meta=None, **arrays):
+    """Write whichever step lists are given, plus any extra named arrays, to a single trace file."""
+    with TraceWriter(path, meta) as writer:
+        if action_steps is not None:
+            writer.write("action_steps", actions_to_array(action_steps))
+        if solution_steps is not None:
+            writer.write("solution_steps", solutions_to_array(solution_steps))
+        if trace_back_steps is not None:
+            writer.write("trace_back_steps", trace_back_to_array(trace_back_steps))
+        for name, array in arrays.items():
+            writer.write(name, array)
+
+
+def read_trace(path, mmap: bool = True):
+    return Trace(path, mmap=mmap)
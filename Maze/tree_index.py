@@ -0,0 +1,97 @@
+import numpy as np
+
+from grid import TOP, RIGHT, DOWN, LEFT
+
+
+class TreeIndex:
+    """Shortest paths in a perfect maze without searching.
+
+    A perfect maze is a spanning tree, so the path between two cells is the tree path through their lowest
+    common ancestor. The tree is rooted at ``root`` once; binary lifting tables ``up[k][i]`` (the 2^k-th
+    ancestor of flat cell i) answer ``lca`` and ``distance`` in O(log n) and ``path`` in O(path length).
+    """
+
+    def __init__(self, grid, root=(0, 0)):
+        self.rows, self.cols = grid.rows, grid.cols
+        self.root = root
+        n = self.rows * self.cols
+        parent, depth = self._bfs(grid, root[0] * self.cols + root[1])
+        self.parent = np.array(parent, dtype=np.int32)
+        self.depth = np.array(depth, dtype=np.int32)
+        self.up = np.empty((max(1, int(self.depth.max()).bit_length()), n), dtype=np.int32)
+        self.up[0] = self.parent
+        self.up[0, self.up[0] < 0] = np.flatnonzero(self.up[0] < 0)
+        for k in range(1, len(self.up)):
+            self.up[k] = self.up[k - 1][self.up[k - 1]]
+        self._parent = memoryview(self.parent)
+        self._depth = memoryview(self.depth)
+
+    @staticmethod
+    def _bfs(grid, root):
+        rows, cols, walls = grid.rows, grid.cols, memoryview(grid.walls.reshape(-1))
+        n = rows * cols
+        # (wall bit, flat index step) in OFFSET order
+        moves = ((RIGHT, 1), (DOWN, cols), (LEFT, -1), (TOP, -cols))
+        parent, depth = [-1] * n, [-1] * n
+        depth[root] = 0
+        queue, edges = [root], 0
+        for cur in queue:
+            mask = walls[cur]
+            for bit, step in moves:
+                if mask & bit:
+                    continue
+                edges += 1
+                nxt = cur + step
+                if depth[nxt] < 0:
+                    depth[nxt] = depth[cur] + 1
+                    parent[nxt] = cur
+                    queue.append(nxt)
+        # every open wall was seen from both sides
+        if len(queue) != n or edges // 2 != n - 1:
+            raise ValueError(f"the maze isn't perfect: {len(queue)} of {n} cells reachable, "
+                             f"{edges // 2} passages for a tree of {n - 1}")
+        return parent, depth
+
+    def _flat(self, cell):
+        return cell[0] * self.cols + cell[1]
+
+    def _lca(self, a: int, b: int):
+        up, depth = self.up, self._depth
+        if depth[a] < depth[b]:
+            a, b = b, a
+        diff, k = depth[a] - depth[b], 0
+        while diff:
+            if diff & 1:
+                a = int(up[k, a])
+            diff >>= 1
+            k += 1
+        if a == b:
+            return a
+        for k in range(len(up) - 1, -1, -1):
+            if up[k, a] != up[k, b]:
+                a, b = int(up[k, a]), int(up[k, b])
+        return self._parent[a]
+
+    def lca(self, a, b):
+        return divmod(self._lca(self._flat(a), self._flat(b)), self.cols)
+
+    def distance(self, a, b):
+        a, b = self._flat(a), self._flat(b)
+        return self._depth[a] + self._depth[b] - 2 * self._depth[self._lca(a, b)]
+
+    def path(self, a, b):
+        """Cells from a to b, both included."""
+        a, b = self._flat(a), self._flat(b)
+        top, parent = self._lca(a, b), self._parent
+        head, tail = [], []
+        while a != top:
+            head.append(a)
+            a = parent[a]
+        while b != top:
+            tail.append(b)
+            b = parent[b]
+        head.append(top)
+        return [divmod(cell, self.cols) for cell in head + tail[::-1]]
+
+    def nbytes(self):
+        return self.parent.nbytes + self.depth.nbytes + self.up.nbytes
@@ -0,0 +1,88 @@
+from math import ceil
+
+import numpy as np
+from manim import VGroup
+
+from grid import Grid
+
+
+class Viewport(VGroup):
+    """Cell mobjects for the part of a big maze around a moving view, recycled through a pool.
+
+    The shown walls and cell colours of the whole maze live in arrays; only cells within ``margin`` cells of
+    the ``width`` x ``height`` view exist as mobjects, so the mobject count and the cost of ``follow`` depend
+    on the view, not the maze. ``make_cell`` builds a fresh cell with all four walls, a recycled cell is
+    rebound with ``set_walls`` and its square's colour.
+    """
+
+    def __init__(self, maze, make_cell, width: float, height: float, cell_color, margin: int = 1, **kwargs):
+        super().__init__(**kwargs)
+        self.maze = maze
+        self.make_cell = make_cell
+        self.cell_color = cell_color
+        self.half_rows = ceil(height / maze.cell_size / 2) + margin
+        self.half_cols = ceil(width / maze.cell_size / 2) + margin
+        # the walls as currently shown, carving removes them one at a time
+        self.shown = Grid(maze.rows, maze.cols)
+        # index into colors, 0 for an unmarked cell
+        self.marks = np.zeros((maze.rows, maze.cols), dtype=np.uint8)
+        self.colors = [None]
+        self.active = {}
+        self.pool = []
+        self.center_cell = None
+
+    def cell_at(self, point):
+        maze = self.maze
+        x = round((maze.rows - 1) / 2 - point[1] / maze.cell_size)
+        y = round(point[0] / maze.cell_size + (maze.cols - 1) / 2)
+        return min(max(x, 0), maze.rows - 1), min(max(y, 0), maze.cols - 1)
+
+    def bind(self, cell, x: int, y: int):
+        cell.x, cell.y = x, y
+        cell.move_to(self.maze.cell_center(x, y))
+        cell.set_walls(self.shown.walls[x, y])
+        cell.square.set_color(self.colors[self.marks[x, y]] or self.cell_color)
+        return cell
+
+    def follow(self, point):
+        """Bring the cells around ``point`` into existence, recycling the ones that left the view."""
+        center_x, center_y = self.cell_at(point)
+        if self.center_cell == (center_x, center_y):
+            return self
+        self.center_cell = center_x, center_y
+        rows = range(max(center_x - self.half_rows, 0), min(center_x + self.half_rows + 1, self.maze.rows))
+        cols = range(max(center_y - self.half_cols, 0), min(center_y + self.half_cols + 1, self.maze.cols))
+        for key in [key for key in self.active if key[0] not in rows or key[1] not in cols]:
+            cell = self.active.pop(key)
+            self.remove(cell)
+            self.pool.append(cell)
+        for x in rows:
+            for y in cols:
+                if (x, y) not in self.active:
+                    cell = self.pool.pop() if self.pool else self.make_cell()
+                    self.active[x, y] = self.bind(cell, x, y)
+                    self.add(cell)
+        return self
+
+    def refresh(self, x: int, y: int):
+        cell = self.active.get((x, y))
+        return cell and self.bind(cell, x, y)
+
+    def remove_wall(self, x: int, y: int, direction: str):
+        next_x, next_y = self.shown.remove_wall(x, y, direction)
+        self.refresh(x, y)
+        self.refresh(next_x, next_y)
+
+    def sync(self, walls):
+        self.shown.walls[:] = walls
+        for x, y in self.active:
+            self.refresh(x, y)
+        return self
+
+    def mark(self, x: int, y: int, color):
+        """Colour cell (x, y), returns its square while it is in view, None otherwise."""
+        if color not in self.colors:
+            self.colors.append(color)
+        self.marks[x, y] = self.colors.index(color)
+        cell = self.refresh(x, y)
+        return cell and cell.square
@@ -0,0 +1,96 @@
+from manim import *
+
+import numpy as np
+
+from grid import TOP, RIGHT, DOWN, LEFT
+
+
+def _runs(mask):
+    # [start, end) index pairs of consecutive True entries
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1))
+
+
+class MazeWalls(VGroup):
+    """Every wall segment drawn once: one polyline per grid line instead of four Lines per Cell.
+
+    ``horizontal[i][j]`` is the wall above cell (i, j), ``vertical[i][j]`` the wall left of it.
+    Removing a wall only rebuilds the grid line it lies on.
+    """
+
+    def __init__(self, rows: int, cols: int, cell_size: float = 1, color="#ECEFF4", **kwargs):
+        super().__init__(**kwargs)
+        self.rows = rows
+        self.cols = cols
+        self.cell_size = cell_size
+        self.color = color
+        self.horizontal = np.ones((rows + 1, cols), dtype=bool)
+        self.vertical = np.ones((rows, cols + 1), dtype=bool)
+        # top left corner of the grid, the grid is centered on the origin like arrange_in_grid
+        self.corner = np.array([-cols * cell_size / 2, rows * cell_size / 2, 0])
+        self.horizontal_paths = [VMobject(stroke_color=color) for _ in range(rows + 1)]
+        self.vertical_paths = [VMobject(stroke_color=color) for _ in range(cols + 1)]
+        self.add(*self.horizontal_paths, *self.vertical_paths)
+        self.set_z_index(1)
+        self.rebuild()
+
+    def point(self, i, j):
+        return self.corner + np.array([j * self.cell_size, -i * self.cell_size, 0])
+
+    def segment(self, x: int, y: int, direction: str):
+        # (is_horizontal, grid line index, position along the line)
+        if direction == "Top":
+            return True, x, y
+        if direction == "Down":
+            return True, x + 1, y
+        if direction == "Left":
+            return False, y, x
+        return False, y + 1, x
+
+    def segment_line(self, x: int, y: int, direction: str):
+        horizontal, line, k = self.segment(x, y, direction)
+        if horizontal:
+            start, end = self.point(line, k), self.point(line, k + 1)
+        else:
+            start, end = self.point(k, line), self.point(k + 1, line)
+        return Line(start, end, color=self.color).set_z_index(1)
+
+    def rebuild_horizontal(self, i: int):
+        path = self.horizontal_paths[i]
+        path.clear_points()
+        for start, end in _runs(self.horizontal[i]):
+            path.start_new_path(self.point(i, start))
+            path.add_line_to(self.point(i, end))
+
+    def rebuild_vertical(self, j: int):
+        path = self.vertical_paths[j]
+        path.clear_points()
+        for start, end in _runs(self.vertical[:, j]):
+            path.start_new_path(self.point(start, j))
+            path.add_line_to(self.point(end, j))
+
+    def rebuild(self):
+        for i in range(self.rows + 1):
+            self.rebuild_horizontal(i)
+        for j in range(self.cols + 1):
+            self.rebuild_vertical(j)
+        return self
+
+    def remove_wall(self, x: int, y: int, direction: str):
+        horizontal, line, k = self.segment(x, y, direction)
+        if horizontal:
+            self.horizontal[line, k] = False
+            self.rebuild_horizontal(line)
+        else:
+            self.vertical[k, line] = False
+            self.rebuild_vertical(line)
+        # a standalone copy of the removed segment, for fading it out
+        return self.segment_line(x, y, direction)
+
+    def sync(self, walls):
+        """Match a Grid wall bitmask array, e.g. to show an already carved maze."""
+        self.horizontal[:-1] = (walls & TOP) != 0
+        self.horizontal[-1] = (walls[-1] & DOWN) != 0
+        self.vertical[:, :-1] = (walls & LEFT) != 0
+        self.vertical[:, -1] = (walls[:, -1] & RIGHT) != 0
+        return self.rebuild()
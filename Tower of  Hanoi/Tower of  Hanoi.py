@@ -1,97 +1,146 @@
 from manim import *
 from numpy import array
 from math import log2
-
-config.background_color = "#3B4252"
-
-red = "#BF616A"
-orange = "#D08770"
-yellow = "#EBCB8B"
-green = "#A3BE8C"
-purple = "#B48EAD"
-gray = "#D8DEE9"
-white = "#ECEFF4"
-
-
-class Test(Scene):
-    def construct(self):
-        self.add_sound("sound/relaxing.mp3")
-        b_peg = Rectangle(height=6, width=0.5, color=gray, fill_color=gray,
-                          fill_opacity=0.1).set_z_index(0.5)
-        a_peg = Rectangle(height=6, width=0.5, color=gray, fill_color=gray,
-                          fill_opacity=0.1).set_z_index(0.5)
-        c_peg = Rectangle(height=6, width=0.5, color=gray, fill_color=gray,
-                          fill_opacity=0.1).set_z_index(0.5)
-        pegs = VGroup(a_peg, b_peg, c_peg)
+import sys
+from pathlib import Path
+
+from frame_stewart import FrameStewart, layout
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.palette import BACKGROUND, red, orange, yellow, green, purple, gray, white
+from common.replay import Seek
+from common.schedule import FrameBudget
+from common.segments import SegmentedScene
+from common.tex_cache import tex_cache
+
+config.background_color = BACKGROUND
+
+
+def make_disks(n: int, k: int = 3):
+    # the stack spans the same height for any n, five disks give the original 1 unit disks 1.25 apart
+    _, level_height, widths = layout(n, k)
+    colors = (red, orange, yellow, green, purple)
+    # from the top (smallest) to the bottom (largest)
+    return [RoundedRectangle(height=level_height * 0.8, width=width,
+                             corner_radius=min(0.5, level_height * 0.4), color=colors[i % len(colors)],
+                             fill_color=colors[i % len(colors)], fill_opacity=0.1, stroke_opacity=1)
+            for i, width in enumerate(widths)]
+
+
+def peg_titles(k: int):
+    if k == 3:
+        return "Source", "Auxiliary", "Target"
+    return ("Source", *(f"Auxiliary {i}" for i in range(1, k - 1)), "Target")
+
+
+class Test(SegmentedScene):
+    N = 5
+    # pegs, more than 3 solve with Frame-Stewart
+    K = 3
+    # seconds for all the moves, the middle ones are fast-forwarded when they don't fit; None plays every move
+    DURATION = None
+    soundtrack = "sound/relaxing.mp3"
+    # both segments start from an empty scene, see SegmentedScene
+    segments = (
+        ("solution", None),
+        ("analysis", None),
+    )
+
+    def solution(self):
+        N, K = self.N, self.K
+        names = [chr(ord('A') + i) for i in range(K)]
+        xs, level_height, _ = layout(N, K)
+        pegs = VGroup(*[Rectangle(height=6, width=0.5, color=gray, fill_color=gray,
+                                  fill_opacity=0.1).set_z_index(0.5) for _ in range(K)])
         self.play(Create(pegs), run_time=2)
-        self.play(a_peg.animate.move_to(b_peg.get_center() + LEFT * 4),
-                  c_peg.animate.move_to(b_peg.get_center() + RIGHT * 4))
+        self.play(*[peg.animate.set_x(x) for peg, x in zip(pegs, xs) if x])
 
-        src_tex = MathTex("\\text{Source}").next_to(a_peg.get_bottom(), DOWN)
-        aux_tex = MathTex("\\text{Auxiliary}").next_to(b_peg.get_bottom(), DOWN)
-        tar_tex = MathTex("\\text{Target}").next_to(c_peg.get_bottom(), DOWN)
+        # the titles shrink with the peg spacing once they would overlap
+        title_scale = min(1, (xs[1] - xs[0]) / 4)
+        titles = [MathTex(f"\\text{{{title}}}").scale(title_scale).next_to(peg.get_bottom(), DOWN)
+                  for title, peg in zip(peg_titles(K), pegs)]
+        tar_tex = titles[-1]
 
-        name = VGroup(src_tex, aux_tex, tar_tex)
+        name = VGroup(*titles)
         self.play(Write(name), run_time=2)
 
         self.wait(1)
 
-        disk_1 = RoundedRectangle(height=1, width=2, color=red, fill_color=red, fill_opacity=0.1,
-                                  stroke_opacity=1).move_to(a_peg.get_top() + DOWN * 0.5)
-        disk_2 = RoundedRectangle(height=1, width=2.5, color=orange, fill_color=orange, fill_opacity=0.1,
-                                  stroke_opacity=1).next_to(disk_1,
-                                                            DOWN)
-        disk_3 = RoundedRectangle(height=1, width=3, color=yellow, fill_color=yellow, fill_opacity=0.1,
-                                  stroke_opacity=1).next_to(disk_2,
-                                                            DOWN)
-        disk_4 = RoundedRectangle(height=1, width=3.5, color=green, fill_color=green, fill_opacity=0.1,
-                                  stroke_opacity=1).next_to(disk_3,
-                                                            DOWN)
-        disk_5 = RoundedRectangle(height=1, width=4, color=purple, fill_color=purple, fill_opacity=0.1,
-                                  stroke_opacity=1).next_to(disk_4,
-                                                            DOWN)
-
-        disks = VGroup(disk_1, disk_2, disk_3, disk_4, disk_5)
-        self.play(Create(disks), run_time=2)
+        disk_list = make_disks(N, K)
 
         # from the bottom to the top
-        a_disk_pos = list(map(lambda x: x.get_center(), (disk_5, disk_4, disk_3, disk_2, disk_1)))
-        # print(a_disk_pos)
-        b_disk_pos = [array([0., -2.5, 0.]), array([0., -1.25, 0.]), array([0., 0., 0.]), array([0., 1.25, 0.]),
-                      array([0., 2.5, 0.])]
-        c_disk_pos = [array([4., -2.5, 0.]), array([4., -1.25, 0.]), array([4., 0., 0.]), array([4., 1.25, 0.]),
-                      array([4., 2.5, 0.])]
-
-        disk_pos = {'A': a_disk_pos, 'B': b_disk_pos, 'C': c_disk_pos}
-        towers = {'A': [disk_5, disk_4, disk_3, disk_2, disk_1], 'B': [], 'C': []}
+        disk_pos = {peg_name: [array([x, -3.125 + level_height * (level + 0.5), 0.]) for level in range(N)]
+                    for peg_name, x in zip(names, xs)}
+        towers = {peg_name: [] for peg_name in names}
+        towers['A'] = disk_list[::-1]
+        for level, disk in enumerate(towers['A']):
+            disk.move_to(disk_pos['A'][level])
+
+        disks = VGroup(*disk_list)
+        self.play(Create(disks), run_time=2)
 
         msg = Tex().to_edge(UR)
         status = Tex().to_edge(UL)
         steps = Tex().move_to(tar_tex.get_right())
         text = VGroup(msg, status, steps)
 
+        def labels(src, tar, step, counts):
+            return f'{src} to {tar}', ', '.join(str(counts[peg_name]) for peg_name in names), f'{step}'
+
+        def label_mobjects(src, tar, step):
+            move_label, status_label, step_label = labels(src, tar, step,
+                                                          {peg_name: len(towers[peg_name]) for peg_name in names})
+            return (tex_cache.get(Tex, move_label).to_edge(UR), tex_cache.get(Tex, status_label).to_edge(UL),
+                    tex_cache.get(Tex, step_label).move_to(tar_tex.get_right() + RIGHT * 1.3))
+
         def move_to(src, tar, step):
             top = towers[src].pop()
             towers[tar].append(top)
+            new_msg, new_status, new_steps = label_mobjects(src, tar, step)
             self.play(top.animate.move_to(disk_pos[tar][len(towers[tar]) - 1]),
-                      Transform(msg, Tex(f'{src} to {tar}').to_edge(UR)),
-                      Transform(status,
-                                Tex(f'{len(towers["A"])}, {len(towers["B"])}, {len(towers["C"])}').to_edge(UL)),
-                      Transform(steps, Tex(f'{step}').move_to(tar_tex.get_right() + RIGHT * 1.3)))
-
-        operations = [('A', 'C'), ('A', 'B'), ('C', 'B'), ('A', 'C'), ('B', 'A'), ('B', 'C'), ('A', 'C'), ('A', 'B'),
-                      ('C', 'B'), ('C', 'A'), ('B', 'A'), ('C', 'B'), ('A', 'C'), ('A', 'B'), ('C', 'B'), ('A', 'C'),
-                      ('B', 'A'), ('B', 'C'), ('A', 'C'), ('B', 'A'), ('C', 'B'), ('C', 'A'), ('B', 'A'), ('B', 'C'),
-                      ('A', 'C'), ('A', 'B'), ('C', 'B'), ('A', 'C'), ('B', 'A'), ('B', 'C'), ('A', 'C')]
-
-        for i in range(len(operations)):
-            s, t = operations[i]
-            move_to(s, t, i + 1)
+                      Transform(msg, new_msg), Transform(status, new_status), Transform(steps, new_steps))
+
+        solver = FrameStewart(Path(config.media_dir) / "frame_stewart.json")
+        cursor = solver.cursor(N, names)
+
+        def seek(k):
+            # jump straight to the state after k moves, closed form for 3 pegs, a replay of the moves for more
+            for peg_name, stack in cursor.seek(k).items():
+                towers[peg_name] = [disk_list[d - 1] for d in stack]
+                for level, disk in enumerate(towers[peg_name]):
+                    disk.move_to(disk_pos[peg_name][level])
+            if k:
+                for label, new_label in zip(text, label_mobjects(*cursor.last, k)):
+                    label.become(new_label)
+
+        plan = FrameBudget(cursor.total, self.DURATION or float("inf")).plan()
+        fast_forwards = {start: Seek(VGroup(disks, text), seek, start, end, run_time=run_time)
+                         for kind, start, end, run_time in plan if kind == "compressed"}
+
+        # compile every label shown up front, in parallel: each move played at full detail and each frame a
+        # fast-forward lands on
+        shown = {k for kind, start, end, _ in plan if kind == "detail" for k in range(start + 1, end + 1)}
+        shown.update(k for fast_forward in fast_forwards.values() for k in fast_forward.frame_steps() if k)
+        label_set = set()
+        for k in sorted(shown):
+            counts = {peg_name: len(stack) for peg_name, stack in cursor.seek(k).items()}
+            label_set.update(labels(*cursor.last, k, counts))
+        with self.phase("labels"):
+            tex_cache.warm((Tex, (label,), {}) for label in label_set)
+
+        for kind, start, end, run_time in plan:
+            if kind == "detail":
+                for k in range(start + 1, end + 1):
+                    cursor.seek(k)
+                    move_to(*cursor.last, k)
+            else:
+                self.play(fast_forwards[start])
 
         self.wait(2)
         self.play(Uncreate(pegs), Unwrite(name), Uncreate(disks), Unwrite(text), run_time=2)
         self.wait(1)
 
+    def analysis(self):
         code = '''
                 def Hanoi(n, src, aux, tar):
                     if n == 0:
@@ -0,0 +1,146 @@
+"""Tower of Hanoi on k >= 3 pegs with the Frame-Stewart algorithm.
+
+To move n disks with k pegs: move the top t disks to an intermediate peg using all k pegs, the other n - t
+to the target with the k - 1 pegs left, then the t disks on top of them with all k pegs again. The best t
+for every (n, k) comes from the recurrence ``FS(n, k) = min_t 2 FS(t, k) + FS(n - t, k - 1)``, filled in
+bottom-up once and optionally kept in a JSON file across runs.
+"""
+import json
+import os
+from pathlib import Path
+
+from hanoi import move, moves, state_after
+
+
+class FrameStewart:
+    """Memoized table of the optimal split ``t`` and move count for every (n, k) asked for so far."""
+
+    def __init__(self, path=None):
+        self.path = path
+        # count[k][n] and split[k][n], k >= 3
+        self.count = {}
+        self.split = {}
+        if path is not None:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                table = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.count = {int(k): column for k, column in table["count"].items()}
+        self.split = {int(k): column for k, column in table["split"].items()}
+
+    def save(self):
+        if self.path is None:
+            return
+        partial = Path(f"{self.path}.{os.getpid()}.partial")
+        with open(partial, "w") as f:
+            json.dump({"count": self.count, "split": self.split}, f)
+        os.replace(partial, self.path)
+
+    def _extend(self, n: int, k: int):
+        if k < 3:
+            raise ValueError(f"Frame-Stewart needs at least 3 pegs, got {k}")
+        grown = False
+        for j in range(3, k + 1):
+            count, split = self.count.setdefault(j, [0]), self.split.setdefault(j, [0])
+            for m in range(len(count), n + 1):
+                grown = True
+                if j == 3:
+                    count.append((1 << m) - 1)
+                    split.append(m - 1)
+                    continue
+                previous = self.count[j - 1]
+                best = min(range(1, m), key=lambda t: 2 * count[t] + previous[m - t], default=0)
+                count.append(2 * count[best] + previous[m - best])
+                split.append(best)
+        if grown:
+            self.save()
+
+    def moves_count(self, n: int, k: int):
+        self._extend(n, k)
+        return self.count[k][n]
+
+    def best_split(self, n: int, k: int):
+        self._extend(n, k)
+        return self.split[k][n]
+
+    def moves(self, n: int, pegs="ABCD"):
+        """All the moves of n disks from ``pegs[0]`` to ``pegs[-1]`` as (from, to), generated lazily.
+
+        Pending sub-towers are kept on an explicit stack, so memory grows with the number of pegs and the
+        depth of the split table, not with the number of moves.
+        """
+        pegs = tuple(pegs)
+        self._extend(n, len(pegs))
+        stack = [(n, pegs)]
+        while stack:
+            m, (src, *aux, tar) = stack.pop()
+            if m == 0:
+                continue
+            if m == 1:
+                yield src, tar
+            elif not aux[1:]:
+                yield from moves(m, src, aux[0], tar)
+            else:
+                t, mid, others = self.split[len(aux) + 2][m], aux[0], aux[1:]
+                # popped in reverse: t disks out of the way, the rest without mid, the t disks back on top
+                stack.append((t, (mid, src, *others, tar)))
+                stack.append((m - t, (src, *others, tar)))
+                stack.append((t, (src, tar, *others, mid)))
+
+    def cursor(self, n: int, pegs="ABCD"):
+        return Cursor(self, n, pegs)
+
+
+class Cursor:
+    """The towers after any number of moves, disks numbered from 1 (the smallest), bottom to top.
+
+    Three pegs use the closed forms in hanoi; more pegs replay the move stream, which is cheap going forward
+    and restarts when seeking backwards.
+    """
+
+    def __init__(self, table: FrameStewart, n: int, pegs="ABCD"):
+        self.table = table
+        self.n = n
+        self.pegs = tuple(pegs)
+        self.total = table.moves_count(n, len(self.pegs))
+        self.reset()
+
+    def reset(self):
+        self.k = 0
+        self.last = None
+        self.towers = {peg: [] for peg in self.pegs}
+        self.towers[self.pegs[0]] = list(range(self.n, 0, -1))
+        self._moves = self.table.moves(self.n, self.pegs)
+
+    def seek(self, k: int):
+        """Towers after k moves, ``last`` is then the k-th move (None for k = 0)."""
+        if not 0 <= k <= self.total:
+            raise ValueError(f"move {k} out of range [0, {self.total}] for {self.n} disks")
+        if len(self.pegs) == 3:
+            self.k = k
+            self.towers = state_after(self.n, k, *self.pegs)
+            self.last = move(self.n, k, *self.pegs) if k else None
+            return self.towers
+        if k < self.k:
+            self.reset()
+        while self.k < k:
+            src, tar = self.last = next(self._moves)
+            self.towers[tar].append(self.towers[src].pop())
+            self.k += 1
+        return self.towers
+
+
+def layout(n: int, k: int, width: float = 12, height: float = 6.25):
+    """x of every peg, the height of a disk level and the disk widths from the smallest up.
+
+    Three pegs land 4 apart at -4, 0, 4 with disks 2 to 4 wide; more pegs share ``width`` and shrink the
+    disks to match. The widest disk is ``spacing`` wide, so pegs and disks together span ``k * spacing``.
+    """
+    spacing = min(4, width / k)
+    xs = [(i - (k - 1) / 2) * spacing for i in range(k)]
+    widths = [(2 + 2 * i / max(n - 1, 1)) * spacing / 4 for i in range(n)]
+    return xs, height / n, widths
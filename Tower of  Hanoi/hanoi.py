@@ -0,0 +1,55 @@
+"""Iterative Tower of Hanoi, moves are numbered from 1 to 2 ** n - 1.
+
+Move k moves disk ``ctz(k) + 1`` (1 is the smallest), from peg ``(k & (k - 1)) % 3`` to peg
+``((k | (k - 1)) + 1) % 3``. Those peg indices carry the tower to index 2 when n is odd and to index 1
+when n is even, ``_pegs`` maps them onto the real peg names.
+"""
+
+
+def _pegs(n: int, src, aux, tar):
+    return (src, aux, tar) if n % 2 else (src, tar, aux)
+
+
+def _check(n: int, k: int, first: int):
+    if not first <= k <= (1 << n) - 1:
+        raise ValueError(f"move {k} out of range [{first}, {(1 << n) - 1}] for {n} disks")
+
+
+def disk(k: int):
+    """The disk moved by move k, 1 is the smallest."""
+    return (k & -k).bit_length()
+
+
+def move(n: int, k: int, src="A", aux="B", tar="C"):
+    """(from, to) of the k-th move, without replaying moves 1 .. k - 1."""
+    _check(n, k, 1)
+    pegs = _pegs(n, src, aux, tar)
+    return pegs[(k & (k - 1)) % 3], pegs[((k | (k - 1)) + 1) % 3]
+
+
+def moves(n: int, src="A", aux="B", tar="C"):
+    """All 2 ** n - 1 moves as (from, to), in O(1) memory."""
+    pegs = _pegs(n, src, aux, tar)
+    for k in range(1, 1 << n):
+        yield pegs[(k & (k - 1)) % 3], pegs[((k | (k - 1)) + 1) % 3]
+
+
+def disk_peg(n: int, d: int, k: int, src="A", aux="B", tar="C"):
+    """The peg disk d sits on after k moves.
+
+    Disk d has moved ``(k + 2 ** (d - 1)) >> d`` times, always cycling the same way round the pegs:
+    odd disks go 0 -> 2 -> 1, even disks 0 -> 1 -> 2.
+    """
+    _check(n, k, 0)
+    times = (k + (1 << (d - 1))) >> d
+    step = -1 if d % 2 else 1
+    return _pegs(n, src, aux, tar)[times * step % 3]
+
+
+def state_after(n: int, k: int, src="A", aux="B", tar="C"):
+    """Disks on each peg after k moves, bottom to top like the scene's ``towers``."""
+    _check(n, k, 0)
+    towers = {src: [], aux: [], tar: []}
+    for d in range(n, 0, -1):
+        towers[disk_peg(n, d, k, src, aux, tar)].append(d)
+    return towers
@@ -0,0 +1,106 @@
+"""Preview the Hanoi scene's moves without manim, as GIF or MP4.
+
+    python hanoi_preview.py hanoi.mp4 -n 5
+    python hanoi_preview.py hanoi.mp4 -n 30 -k 4 --steps-per-frame 4
+
+Pegs and disks are laid out and coloured like ``Test``; the labels and the analysis are left out.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from common.palette import BACKGROUND, red, orange, yellow, green, purple, gray
+from common.preview import Canvas, FrameWriter
+
+from frame_stewart import FrameStewart, layout
+
+COLORS = (red, orange, yellow, green, purple)
+
+
+class HanoiPreview:
+    """Pegs are drawn once into a base frame; a frame only erases and redraws the disks that moved since the last."""
+
+    def __init__(self, output, n: int, k: int = 3, frame_rate: float = 10, steps_per_frame: int = 1,
+                 move_seconds: float = 1, resolution=(854, 480), table=None):
+        self.n, self.k = n, k
+        self.frame_rate = frame_rate
+        self.steps_per_frame = steps_per_frame
+        self.move_seconds = move_seconds
+        self.table = table or FrameStewart()
+        self.names = [chr(ord('A') + i) for i in range(k)]
+        self.xs, self.level_height, self.widths = layout(n, k)
+        self.canvas = Canvas(*resolution, background=BACKGROUND)
+        # manim's default stroke is about 0.04 units wide
+        self.stroke = max(1, round(0.04 * self.canvas.unit))
+        for x in self.xs:
+            self.canvas.rect(x, 0, 0.5, 6, gray, fill_opacity=0.1, stroke=self.stroke)
+        self.base = self.canvas.frame.copy()
+        self.towers = {name: [] for name in self.names}
+        self.towers['A'] = list(range(n, 0, -1))
+        # disk -> (peg, level) as on the canvas
+        self.drawn = {}
+        self.writer = FrameWriter(output, *resolution, frame_rate)
+
+    def disk_box(self, d: int, peg: str, level: int):
+        return (self.xs[self.names.index(peg)], -3.125 + self.level_height * (level + 0.5), self.widths[d - 1],
+                self.level_height * 0.8)
+
+    def draw(self, d: int, peg: str, level: int):
+        self.canvas.rect(*self.disk_box(d, peg, level), COLORS[(d - 1) % len(COLORS)], fill_opacity=0.1,
+                         stroke=self.stroke)
+
+    def erase(self, d: int, peg: str, level: int):
+        box = self.canvas.box(*self.disk_box(d, peg, level))
+        self.canvas.frame[box] = self.base[box]
+
+    def update(self):
+        places = {d: (peg, level) for peg, stack in self.towers.items() for level, d in enumerate(stack)}
+        moved = [d for d, place in places.items() if self.drawn.get(d) != place]
+        # all erased before any is drawn, a disk may land where another one just left
+        for d in moved:
+            if d in self.drawn:
+                self.erase(d, *self.drawn[d])
+        for d in moved:
+            self.draw(d, *places[d])
+        self.drawn = places
+
+    def hold(self, seconds: float):
+        self.writer.write(self.canvas.frame, max(1, round(seconds * self.frame_rate)))
+
+    def play(self):
+        # pegs and their titles
+        self.hold(6)
+        self.update()
+        self.hold(2)
+        total = self.table.moves_count(self.n, self.k)
+        # a move shown on its own lasts move_seconds, like the scene's play calls
+        repeat = max(1, round(self.move_seconds * self.frame_rate)) if self.steps_per_frame == 1 else 1
+        for i, (src, tar) in enumerate(self.table.moves(self.n, self.names), 1):
+            self.towers[tar].append(self.towers[src].pop())
+            if i % self.steps_per_frame == 0 or i == total:
+                self.update()
+                self.writer.write(self.canvas.frame, repeat)
+        self.hold(4)
+        self.canvas.clear()
+        self.hold(1)
+        return self.writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", help=".gif needs Pillow, anything else ffmpeg")
+    parser.add_argument("-n", "--disks", type=int, default=5)
+    parser.add_argument("-k", "--pegs", type=int, default=3)
+    parser.add_argument("--frame-rate", type=float, default=10)
+    parser.add_argument("--steps-per-frame", type=int, default=1)
+    parser.add_argument("--move-seconds", type=float, default=1)
+    parser.add_argument("--resolution", type=int, nargs=2, default=(854, 480), metavar=("WIDTH", "HEIGHT"))
+    args = parser.parse_args()
+    preview = HanoiPreview(args.output, args.disks, args.pegs, args.frame_rate, args.steps_per_frame,
+                           args.move_seconds, tuple(args.resolution))
+    print(preview.play(), preview.writer.frames, "frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Benchmarks for maze generation and search, Hanoi move generation, mobject construction and rendering.
+
+    python benchmarks/run.py -o results.json
+    python benchmarks/run.py --suite maze_algorithm hanoi_algorithm --compare results.json
+
+Every case runs in a fresh process, so the reported peak RSS belongs to that case alone. The algorithm
+suites need only NumPy; the mobject and render suites need manim (and LaTeX for the rendered labels).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MAZE_DIR = ROOT / "Maze"
+HANOI_DIR = ROOT / "Tower of  Hanoi"
+MAZE_SCENE = MAZE_DIR / "Maza.py"
+HANOI_SCENE = HANOI_DIR / "Tower of  Hanoi.py"
+
+MAZE_SIZES = [(12, 20), (50, 50), (100, 100), (250, 250), (500, 500), (1000, 1000)]
+HANOI_DISKS = list(range(3, 21))
+
+
+def _paths():
+    for path in (ROOT, MAZE_DIR, HANOI_DIR):
+        if str(path) not in sys.path:
+            sys.path.append(str(path))
+
+
+def _rss_mb():
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def maze_algorithm(rows, cols, generator="recursive_backtracker", algorithm="a_star"):
+    _paths()
+    from generators import GENERATORS
+    from grid import Grid
+    from search import search
+
+    rng = random.Random(4843)
+    grid = Grid(rows, cols)
+    begin = time.perf_counter()
+    for (prev_x, prev_y, direction), _ in GENERATORS[generator](rows, cols, rng):
+        grid.remove_wall(prev_x, prev_y, direction)
+    generation = time.perf_counter() - begin
+    result = search(grid, (0, 0), (rows - 1, cols - 1), algorithm=algorithm)
+    return {"generation_seconds": generation, "search_seconds": result.seconds, "expanded": result.expanded,
+            "pushes": result.pushes, "grid_bytes": grid.nbytes()}
+
+
+def hanoi_algorithm(n):
+    _paths()
+    from hanoi import moves, state_after
+
+    begin = time.perf_counter()
+    count = sum(1 for _ in moves(n))
+    generation = time.perf_counter() - begin
+    begin = time.perf_counter()
+    state_after(n, 1 << (n - 1))
+    return {"moves": count, "moves_seconds": generation, "seek_seconds": time.perf_counter() - begin}
+
+
+def maze_mobjects(rows, cols, display="cells"):
+    _paths()
+    from common.segments import load_scene
+
+    maze = load_scene(MAZE_SCENE, "Maze")(rows, cols, cell_size=0.6, display=display)
+    maze.generate()
+    begin = time.perf_counter()
+    maze_display = maze.build_display()
+    return {"build_seconds": time.perf_counter() - begin, "mobjects": len(maze_display.get_family())}
+
+
+def hanoi_mobjects(n):
+    _paths()
+    from common.segments import load_scene
+
+    make_disks = load_scene(HANOI_SCENE, "make_disks")
+    begin = time.perf_counter()
+    disks = make_disks(n)
+    return {"build_seconds": time.perf_counter() - begin, "mobjects": len(disks)}
+
+
+def _render(scene_file, scene_name, segment, attributes):
+    _paths()
+    from manim import tempconfig
+    from common.segments import load_scene
+
+    scene_cls = type(scene_name, (load_scene(scene_file, scene_name),), attributes)
+    # the scenes load their images and sounds relative to their own folder
+    os.chdir(Path(scene_file).parent)
+    with tempfile.TemporaryDirectory() as media_dir, \
+            tempconfig({"quality": "low_quality", "disable_caching": True, "media_dir": media_dir,
+                        "verbosity": "ERROR", "progress_bar": "none", "input_file": str(scene_file)}):
+        begin = time.perf_counter()
+        scene = scene_cls(segment=segment)
+        scene.render()
+        return {"render_seconds": time.perf_counter() - begin, "plays": scene.renderer.num_plays,
+                "duration": scene.renderer.time}
+
+
+def maze_render(rows, cols, duration=5):
+    return _render(MAZE_SCENE, "Test", "generation",
+                   {"ROWS": rows, "COLS": cols, "DISPLAY": "merged", "DURATION": duration})
+
+
+def hanoi_render(n, duration=10):
+    return _render(HANOI_SCENE, "Test", "solution", {"N": n, "DURATION": duration, "soundtrack": None})
+
+
+SUITES = {
+    "maze_algorithm": (maze_algorithm, [{"rows": rows, "cols": cols} for rows, cols in MAZE_SIZES]),
+    "hanoi_algorithm": (hanoi_algorithm, [{"n": n} for n in HANOI_DISKS]),
+    "maze_mobjects": (maze_mobjects, [{"rows": rows, "cols": cols, "display": display}
+                                      for rows, cols in MAZE_SIZES for display in ("cells", "merged", "raster")]),
+    "hanoi_mobjects": (hanoi_mobjects, [{"n": n} for n in HANOI_DISKS]),
+    "maze_render": (maze_render, [{"rows": rows, "cols": cols} for rows, cols in MAZE_SIZES]),
+    "hanoi_render": (hanoi_render, [{"n": n} for n in HANOI_DISKS]),
+}
+# mobject and render suites are skipped above these sizes unless --max-cells says otherwise
+DEFAULT_MAX_CELLS = {"maze_mobjects": 100 * 100, "maze_render": 100 * 100}
+
+
+def _run_case(suite, params):
+    baseline = _rss_mb()
+    begin = time.perf_counter()
+    metrics = SUITES[suite][0](**params)
+    return {"seconds": time.perf_counter() - begin, "peak_rss_mb": _rss_mb(), "baseline_rss_mb": baseline,
+            **metrics}
+
+
+def run_case(suite, params, timeout=None):
+    # spawn, not fork, so peak RSS isn't inherited from this process; one process per case
+    pool = ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn"))
+    try:
+        return pool.submit(_run_case, suite, params).result(timeout=timeout)
+    except TimeoutError:
+        # shutdown() alone would wait for the case to finish, a hung render has to be killed
+        for process in list(pool._processes.values()):
+            process.terminate()
+        raise
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _case_name(params):
+    return ",".join(f"{key}={value}" for key, value in params.items())
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "-C", str(ROOT), "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = {(row["suite"], row["case"]): row for row in json.load(f)["results"]}
+    print(f"{'suite':<16} {'case':<34} {'metric':<20} {'before':>12} {'after':>12} {'ratio':>7}")
+    for row in results:
+        before = baseline.get((row["suite"], row["case"]))
+        if before is None or "error" in row or "error" in before:
+            continue
+        for metric, value in row.items():
+            if (metric.endswith("seconds") or metric.endswith("_mb")) and before.get(metric):
+                print(f"{row['suite']:<16} {row['case']:<34} {metric:<20} {before[metric]:>12.4f} {value:>12.4f} "
+                      f"{value / before[metric]:>7.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--suite", nargs="+", choices=sorted(SUITES), default=sorted(SUITES))
+    parser.add_argument("--max-cells", type=int, default=None,
+                        help="largest maze for the mobject and render suites")
+    parser.add_argument("--max-disks", type=int, default=max(HANOI_DISKS))
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per case")
+    parser.add_argument("-o", "--output", default=None)
+    parser.add_argument("--compare", default=None, help="results JSON of an earlier run")
+    args = parser.parse_args()
+
+    results = []
+    for suite in args.suite:
+        max_cells = args.max_cells or DEFAULT_MAX_CELLS.get(suite)
+        for params in SUITES[suite][1]:
+            if max_cells and params.get("rows", 0) * params.get("cols", 0) > max_cells:
+                continue
+            if params.get("n", 0) > args.max_disks:
+                continue
+            row = {"suite": suite, "case": _case_name(params)}
+            try:
+                row.update(run_case(suite, params, args.timeout))
+            except Exception as error:
+                row["error"] = f"{type(error).__name__}: {error}"
+            results.append(row)
+            print(json.dumps(row), flush=True)
+
+    report = {"commit": _commit(), "timestamp": datetime.now(timezone.utc).isoformat(),
+              "python": platform.python_version(), "platform": platform.platform(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
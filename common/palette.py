@@ -0,0 +1,14 @@
+BACKGROUND = "#3B4252"
+
+red = "#BF616A"
+orange = "#D08770"
+yellow = "#EBCB8B"
+green = "#A3BE8C"
+purple = "#B48EAD"
+gray = "#D8DEE9"
+white = "#ECEFF4"
+
+
+def hex_to_rgba(color: str, alpha: int = 255):
+    color = color.lstrip("#")
+    return int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16), alpha
@@ -0,0 +1,123 @@
+"""Draw the scenes' step traces straight into NumPy frames and write them as GIF or MP4, without manim or LaTeX.
+
+The canvas uses manim's coordinates (8 units high, origin in the middle) and the palette colours, so a
+preview lays things out like the final render, minus the text.
+"""
+import shutil
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+from common.palette import BACKGROUND, hex_to_rgba
+
+FRAME_HEIGHT = 8.0
+
+
+def rgba(color):
+    return np.array(hex_to_rgba(color) if isinstance(color, str) else color, dtype=np.uint8)
+
+
+class Canvas:
+    """An RGBA frame addressed in manim units."""
+
+    def __init__(self, width: int = 854, height: int = 480, background=BACKGROUND):
+        self.width = width
+        self.height = height
+        self.unit = height / FRAME_HEIGHT
+        self.background = rgba(background)
+        self.frame = np.empty((height, width, 4), dtype=np.uint8)
+        self.clear()
+
+    def clear(self):
+        self.frame[:] = self.background
+
+    def corner(self, x: float, y: float, width: float, height: float):
+        """Pixel (row, column) of the top left corner of the box centred on (x, y)."""
+        return (int(round(self.height / 2 - (y + height / 2) * self.unit)),
+                int(round(self.width / 2 + (x - width / 2) * self.unit)))
+
+    def box(self, x: float, y: float, width: float, height: float):
+        """Pixel slices of the box centred on (x, y), clipped to the frame."""
+        top, left = self.corner(x, y, width, height)
+        bottom = top + max(1, int(round(height * self.unit)))
+        right = left + max(1, int(round(width * self.unit)))
+        return (slice(min(max(top, 0), self.height), min(max(bottom, 0), self.height)),
+                slice(min(max(left, 0), self.width), min(max(right, 0), self.width)))
+
+    def rect(self, x: float, y: float, width: float, height: float, color, fill_opacity: float = 1,
+             stroke: int = 0, stroke_color=None):
+        """A rectangle like manim's: filled at ``fill_opacity`` with a ``stroke`` pixels wide border."""
+        region = self.frame[self.box(x, y, width, height)]
+        if fill_opacity >= 1:
+            region[:] = rgba(color)
+        elif fill_opacity > 0:
+            region[..., :3] = region[..., :3] * (1 - fill_opacity) + rgba(color)[:3] * fill_opacity
+        if stroke and region.size:
+            border = rgba(stroke_color or color)
+            for edge in (region[:stroke], region[-stroke:], region[:, :stroke], region[:, -stroke:]):
+                edge[:] = border
+
+    def place(self, x: float, y: float, pixel_height: int, pixel_width: int):
+        """Where a pixel_height x pixel_width image centred on (x, y) lands, clipped to the frame.
+
+        Returns the frame slices and the matching slices of the image; an image that fits whole can be drawn
+        straight into ``frame[frame slices]``, with no copy per frame.
+        """
+        top, left = self.corner(x, y, pixel_width / self.unit, pixel_height / self.unit)
+        rows = slice(max(top, 0), min(top + pixel_height, self.height))
+        cols = slice(max(left, 0), min(left + pixel_width, self.width))
+        return (rows, cols), (slice(rows.start - top, rows.stop - top), slice(cols.start - left, cols.stop - left))
+
+
+class FrameWriter:
+    """Frames to a ``.gif`` (Pillow, kept in memory until ``close``) or any ffmpeg format (piped, e.g. mp4)."""
+
+    def __init__(self, path, width: int, height: int, frame_rate: float = 10):
+        self.path = Path(path)
+        self.frame_rate = frame_rate
+        self.frames = 0
+        self._images = None
+        self._ffmpeg = None
+        if self.path.suffix.lower() == ".gif":
+            from PIL import Image
+
+            self._image = Image
+            self._images = []
+            return
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError(f"writing {self.path.suffix} previews needs ffmpeg on the PATH, .gif needs Pillow")
+        self._ffmpeg = subprocess.Popen(
+            [ffmpeg, "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba", "-s", f"{width}x{height}",
+             "-r", str(frame_rate), "-i", "-", "-pix_fmt", "yuv420p", "-preset", "ultrafast", str(self.path)],
+            stdin=subprocess.PIPE)
+
+    def write(self, frame, repeat: int = 1):
+        self.frames += repeat
+        if self._images is not None:
+            image = self._image.fromarray(np.ascontiguousarray(frame[..., :3]))
+            # Pillow merges identical consecutive frames into one longer one
+            self._images.extend([image] * repeat)
+        else:
+            data = frame.tobytes()
+            for _ in range(repeat):
+                self._ffmpeg.stdin.write(data)
+
+    def close(self):
+        if self._images:
+            self._images[0].save(self.path, save_all=True, append_images=self._images[1:], loop=0,
+                                 duration=1000 / self.frame_rate)
+            self._images = []
+        elif self._ffmpeg is not None:
+            self._ffmpeg.stdin.close()
+            if self._ffmpeg.wait():
+                raise RuntimeError(f"ffmpeg failed writing {self.path}")
+            self._ffmpeg = None
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
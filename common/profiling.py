@@ -0,0 +1,104 @@
+"""Per-phase render profiling: wall time, play() calls, hashing and encoding time, live mobjects, LaTeX work.
+
+Set ``ALGO_VIZ_PROFILE=report.json`` when rendering a SegmentedScene to get one entry per segment.
+"""
+import json
+from contextlib import contextmanager
+from time import perf_counter
+
+import manim.renderer.cairo_renderer as cairo_renderer
+import manim.mobject.text.tex_mobject as tex_mobject
+import manim.utils.tex_file_writing as tex_file_writing
+
+from common.tex_cache import tex_cache
+
+COUNTERS = ("plays", "play_seconds", "hash_calls", "hash_seconds", "frames", "encode_seconds", "tex_requests",
+            "tex_compiles", "tex_cache_hits", "tex_cache_misses")
+
+
+class RenderProfiler:
+    """Wraps ``scene.play``, play hashing, frame encoding and LaTeX compilation with counters.
+
+    ``phase(name)`` attributes everything that happens inside it to ``name``; phases nest, an inner phase is
+    reported as ``outer/inner`` and also counts towards the outer one.
+    """
+
+    def __init__(self):
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.phases = []
+        self.stack = []
+        self.scene = None
+        self._restore = []
+
+    def _patch(self, owner, name, counter, seconds=None):
+        original = getattr(owner, name, None)
+        if original is None:
+            return
+
+        def wrapper(*args, **kwargs):
+            self.counters[counter] += 1
+            begin = perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                if seconds:
+                    self.counters[seconds] += perf_counter() - begin
+
+        setattr(owner, name, wrapper)
+        self._restore.append((owner, name, original))
+
+    def install(self, scene):
+        self.scene = scene
+        self._patch(scene, "play", "plays", "play_seconds")
+        self._patch(cairo_renderer, "get_hash_from_play_call", "hash_calls", "hash_seconds")
+        self._patch(scene.renderer.file_writer, "write_frame", "frames", "encode_seconds")
+        self._patch(tex_mobject, "tex_to_svg_file", "tex_requests")
+        self._patch(tex_file_writing, "compile_tex", "tex_compiles")
+        return self
+
+    def uninstall(self):
+        for owner, name, original in reversed(self._restore):
+            setattr(owner, name, original)
+        self._restore.clear()
+
+    def _snapshot(self):
+        counters = dict(self.counters)
+        counters["tex_cache_hits"] = tex_cache.hits + tex_cache.disk_hits
+        counters["tex_cache_misses"] = tex_cache.misses + tex_cache.warm_misses
+        # TexCache.warm builds labels in a process pool, out of reach of the patched functions
+        counters["tex_requests"] += tex_cache.warm_misses
+        counters["tex_compiles"] += tex_cache.warm_compiles
+        return counters
+
+    @contextmanager
+    def phase(self, name: str):
+        self.stack.append(name)
+        entry = {"phase": "/".join(self.stack)}
+        self.phases.append(entry)
+        before, begin = self._snapshot(), perf_counter()
+        try:
+            yield entry
+        finally:
+            after = self._snapshot()
+            entry["wall_seconds"] = perf_counter() - begin
+            entry.update({key: after[key] - before.get(key, 0) for key in after if key in COUNTERS})
+            # manim keeps its own on-disk cache of compiled SVGs
+            entry["tex_svg_cache_hits"] = entry["tex_requests"] - entry["tex_compiles"]
+            entry["mobjects"] = len(self.scene.get_mobject_family_members()) if self.scene else None
+            self.stack.pop()
+
+    def report(self):
+        return self.phases
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump({"phases": self.phases}, f, indent=2)
+
+    def print_table(self):
+        columns = ("wall_seconds", "plays", "hash_seconds", "encode_seconds", "frames", "mobjects",
+                   "tex_compiles", "tex_svg_cache_hits", "tex_cache_hits")
+        print(f"{'phase':<24}" + "".join(f"{column:>16}" for column in columns))
+        for entry in self.phases:
+            print(f"{entry['phase']:<24}" + "".join(
+                f"{entry.get(column, 0):>16.3f}" if isinstance(entry.get(column), float)
+                else f"{entry.get(column, 0):>16}" for column in columns))
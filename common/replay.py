@@ -0,0 +1,61 @@
+from math import ceil
+
+from manim import *
+
+
+class StepReplay(Animation):
+    """Replays a whole list of logical steps inside a single ``play`` call.
+
+    ``apply_step(step)`` mutates the scene for one step, ``steps_per_frame`` of them are applied per
+    rendered frame, so one partial movie file is written instead of one per step.
+    Mobjects touched by ``apply_step`` must be ``mobject`` itself or added to the scene after it.
+    """
+
+    def __init__(self, mobject, steps, apply_step, steps_per_frame: int = 1, **kwargs):
+        self.steps = steps
+        self.apply_step = apply_step
+        self.applied = 0
+        kwargs.setdefault("run_time", max(len(steps), 1) / (steps_per_frame * config.frame_rate))
+        kwargs.setdefault("rate_func", linear)
+        super().__init__(mobject, **kwargs)
+
+    def create_starting_mobject(self):
+        # steps mutate the mobject in place, copying a whole maze here would defeat the purpose
+        return Mobject()
+
+    def interpolate_mobject(self, alpha: float):
+        target = min(len(self.steps), ceil(alpha * len(self.steps)))
+        while self.applied < target:
+            self.apply_step(self.steps[self.applied])
+            self.applied += 1
+
+
+class Seek(Animation):
+    """Jumps the scene from logical step ``start`` to ``end`` over ``run_time``.
+
+    ``seek(k)`` must put the scene directly into its state after k steps; it is called once per rendered
+    frame (only when k changes), so the cost depends on the frame count and not on ``end - start``.
+    """
+
+    def __init__(self, mobject, seek, start: int, end: int, **kwargs):
+        self.seek = seek
+        self.start = start
+        self.end = end
+        self.current = None
+        kwargs.setdefault("rate_func", linear)
+        super().__init__(mobject, **kwargs)
+
+    def create_starting_mobject(self):
+        return Mobject()
+
+    def frame_steps(self):
+        """Every k ``seek`` will be called with, e.g. to prepare what those states show before playing."""
+        # the frame times of Scene.play, plus the final interpolate(1) of finish()
+        alphas = [*np.arange(0, self.run_time, 1 / config.frame_rate) / self.run_time, 1]
+        return sorted({self.start + round(alpha * (self.end - self.start)) for alpha in alphas})
+
+    def interpolate_mobject(self, alpha: float):
+        k = self.start + round(alpha * (self.end - self.start))
+        if k != self.current:
+            self.seek(k)
+            self.current = k
@@ -0,0 +1,45 @@
+from manim import config
+
+
+class FrameBudget:
+    """Fits ``total_steps`` logical steps into a video of ``duration`` seconds.
+
+    The first ``head`` and last ``tail`` steps are played one by one at ``detail_run_time`` seconds each,
+    everything in between is fast-forwarded through the remaining frames, several steps per frame.
+    When every step fits at full detail nothing is compressed.
+    """
+
+    def __init__(self, total_steps: int, duration: float, frame_rate=None, head: int = 10, tail: int = 10,
+                 detail_run_time: float = 1):
+        self.total_steps = total_steps
+        self.duration = duration
+        self.frame_rate = frame_rate or config.frame_rate
+        self.head = head
+        self.tail = tail
+        self.detail_run_time = detail_run_time
+
+    def plan(self):
+        """``(kind, start, end, run_time)`` phases covering steps [0, total_steps), kind is "detail" or "compressed".
+
+        Detail phases give the run time of each single step, compressed phases the run time of the whole phase.
+        """
+        if self.total_steps * self.detail_run_time <= self.duration:
+            return [("detail", 0, self.total_steps, self.detail_run_time)]
+        # keep at least one frame for the fast-forward, shrinking head and tail if they don't fit
+        detail = max(0, min(self.head + self.tail, int((self.duration - 1 / self.frame_rate) / self.detail_run_time)))
+        head = min(self.head, (detail + 1) // 2)
+        tail = min(self.tail, detail - head)
+        head = min(self.head, detail - tail)
+        frames = max(1, round((self.duration - detail * self.detail_run_time) * self.frame_rate))
+        end = self.total_steps - tail
+        phases = [("detail", 0, head, self.detail_run_time),
+                  ("compressed", head, end, frames / self.frame_rate),
+                  ("detail", end, self.total_steps, self.detail_run_time)]
+        return [phase for phase in phases if phase[2] > phase[1]]
+
+    def steps_per_frame(self):
+        compressed = [phase for phase in self.plan() if phase[0] == "compressed"]
+        if not compressed:
+            return 1
+        _, start, end, run_time = compressed[0]
+        return (end - start) / (run_time * self.frame_rate)
@@ -0,0 +1,169 @@
+"""Render the independent segments of a scene in parallel and join the partial movies in order.
+
+    cd Maze && python ../common/segments.py Maza.py Test --quality low_quality --processes 4
+"""
+import argparse
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+
+from manim import *
+
+
+class SegmentedScene(Scene):
+    """A scene split into segments that can also be rendered on their own.
+
+    ``segments`` lists ``(segment, state)`` pairs: ``segment`` names the method animating it, ``state``
+    names a method that sets up, without animating, the scene as the previous segments leave it (``None``
+    for an empty scene). A normal render plays every segment in order; ``SegmentedScene(segment=name)``
+    builds the start state and plays only that one.
+
+    With ``ALGO_VIZ_PROFILE=<path>`` set, every segment is a phase of a RenderProfiler and the report is
+    written to ``<path>`` (``<path stem>_<segment>.json`` when rendering a single segment).
+
+    With ``ALGO_VIZ_STEP_CACHE=1`` set and ``cache_params`` defined, partial movies are keyed by a StepCache
+    instead of manim's hash of the whole scene.
+    """
+
+    segments = ()
+    # added over the whole video, render_segments muxes it into the joined movie instead
+    soundtrack = None
+
+    def __init__(self, *args, segment=None, **kwargs):
+        self.segment = segment
+        self.profiler = None
+        self.step_cache = None
+        super().__init__(*args, **kwargs)
+
+    def cache_params(self):
+        """Everything besides the segment sources that decides what the scene shows, None to hash as usual."""
+        return None
+
+    def phase(self, name):
+        """Profile a part of a segment on its own, a no-op unless profiling."""
+        return self.profiler.phase(name) if self.profiler else nullcontext()
+
+    def run_segment(self, name):
+        if self.step_cache:
+            self.step_cache.start(name)
+        with self.phase(name):
+            getattr(self, name)()
+
+    def construct(self):
+        params = self.cache_params()
+        if os.environ.get("ALGO_VIZ_STEP_CACHE") and params is not None:
+            from common.step_cache import StepCache
+
+            self.step_cache = StepCache(params).install(self)
+        report = os.environ.get("ALGO_VIZ_PROFILE")
+        if report:
+            from common.profiling import RenderProfiler
+
+            self.profiler = RenderProfiler().install(self)
+        try:
+            self.construct_segments()
+        finally:
+            # the profiler wraps the step cache's hash function, so it goes first
+            if self.profiler:
+                self.profiler.uninstall()
+                if self.segment is not None:
+                    report = str(Path(report).with_name(f"{Path(report).stem}_{self.segment}.json"))
+                self.profiler.write(report)
+                self.profiler.print_table()
+            if self.step_cache:
+                self.step_cache.uninstall()
+
+    def construct_segments(self):
+        if self.segment is None:
+            if self.soundtrack:
+                self.add_sound(self.soundtrack)
+            for name, _ in self.segments:
+                self.run_segment(name)
+            return
+        state = dict(self.segments)[self.segment]
+        if state:
+            with self.phase(state):
+                getattr(self, state)()
+        self.run_segment(self.segment)
+
+
+def load_scene(scene_file, scene_name):
+    scene_file = Path(scene_file).resolve()
+    # like manim, so modules next to the scene file import as usual
+    sys.path.insert(0, str(scene_file.parent))
+    spec = importlib.util.spec_from_file_location(scene_file.stem.replace(" ", "_"), scene_file)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return getattr(module, scene_name)
+
+
+def _render_segment(scene_file, scene_name, segment, overrides):
+    scene_cls = load_scene(scene_file, scene_name)
+    # manim writes a fixed-name partial_movie_file_list.txt and prunes old partials in this directory,
+    # segments rendering at the same time each need their own
+    partial_movie_dir = f"{overrides.get('partial_movie_dir', config['partial_movie_dir'])}/{segment}"
+    with tempconfig({**overrides, "input_file": str(scene_file), "output_file": f"{scene_name}_{segment}",
+                     "partial_movie_dir": partial_movie_dir}):
+        scene = scene_cls(segment=segment)
+        scene.render()
+        return str(scene.renderer.file_writer.movie_file_path)
+
+
+def join_movies(movies, output, soundtrack=None):
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise RuntimeError("joining segments needs ffmpeg on the PATH")
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listing:
+        for movie in movies:
+            listing.write(f"file '{Path(movie).resolve()}'\n")
+    joined = output if soundtrack is None else str(Path(output).with_suffix(".video" + Path(output).suffix))
+    subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", listing.name,
+                    "-c", "copy", joined], check=True)
+    Path(listing.name).unlink()
+    if soundtrack is not None:
+        # pad the soundtrack with silence and cut it to the video, like Scene.add_sound does
+        subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-i", joined, "-i", soundtrack, "-map", "0:v",
+                        "-map", "1:a", "-c:v", "copy", "-af", "apad", "-shortest", output], check=True)
+        Path(joined).unlink()
+    return output
+
+
+def render_segments(scene_file, scene_name, processes=None, output=None, **overrides):
+    """Render every segment of ``scene_name`` in its own process, then join them in order.
+
+    ``overrides`` are manim config values (e.g. ``quality="low_quality"``) applied in every worker.
+    """
+    scene_cls = load_scene(scene_file, scene_name)
+    names = [name for name, _ in scene_cls.segments]
+    if not names:
+        raise ValueError(f"{scene_name} declares no segments")
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        movies = list(pool.map(_render_segment, [scene_file] * len(names), [scene_name] * len(names), names,
+                               [overrides] * len(names)))
+    output = output or str(Path(movies[0]).with_name(f"{scene_name}.mp4"))
+    soundtrack = scene_cls.soundtrack and str(Path(scene_cls.soundtrack).resolve())
+    return join_movies(movies, output, soundtrack)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scene_file")
+    parser.add_argument("scene_name")
+    parser.add_argument("-p", "--processes", type=int, default=None)
+    parser.add_argument("-q", "--quality", default="high_quality",
+                        choices=["low_quality", "medium_quality", "high_quality", "production_quality",
+                                 "fourk_quality"])
+    parser.add_argument("-o", "--output", default=None)
+    args = parser.parse_args()
+    print(render_segments(args.scene_file, args.scene_name, args.processes, args.output, quality=args.quality))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+import hashlib
+import inspect
+
+
+def code_digest(*objects):
+    """Digest of the source of ``objects`` (modules, classes), one without source counts as empty."""
+    digest = hashlib.sha256()
+    for obj in objects:
+        try:
+            digest.update(inspect.getsource(obj).encode())
+        except (OSError, TypeError):
+            pass
+    return digest.hexdigest()
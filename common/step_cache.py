@@ -0,0 +1,79 @@
+"""Partial movie cache keys built from scene parameters and step indices instead of the mobject graph.
+
+Set ``ALGO_VIZ_STEP_CACHE=1`` when rendering a SegmentedScene that defines ``cache_params``.
+"""
+import hashlib
+import inspect
+import json
+import sys
+from pathlib import Path
+
+import manim.renderer.cairo_renderer as cairo_renderer
+
+from common.source import code_digest
+
+
+class StepCache:
+    """Keys every play call by scene parameters, segment, segment source and play index within the segment.
+
+    Manim hashes every mobject on the scene for each play call, these keys cost the same for any scene size.
+    They see ``params``, the source of the scene's classes and of every module loaded from the scene's
+    directory (the display classes, generators, ...) and of ``common``; after changing anything else that
+    shows up on screen (an image), render once with ``--flush_cache``.
+    """
+
+    def __init__(self, params):
+        self.params = params
+        self.scene = None
+        self.segment = None
+        self.index = 0
+        self._prefix = None
+        self._code = None
+        self._original = None
+
+    def install(self, scene):
+        self.scene = scene
+        self._code = self.code(type(scene))
+        self._original = cairo_renderer.get_hash_from_play_call
+        cairo_renderer.get_hash_from_play_call = self.key
+        return self
+
+    def uninstall(self):
+        if self._original is not None:
+            cairo_renderer.get_hash_from_play_call = self._original
+            self._original = None
+
+    @staticmethod
+    def code(scene_cls):
+        """Digest of the classes of ``scene_cls`` outside manim and of the modules next to it or in common."""
+        classes = [cls for cls in scene_cls.__mro__ if cls.__module__.split(".")[0] not in ("manim", "builtins")]
+        folders = {Path(__file__).resolve().parent}
+        try:
+            folders.add(Path(inspect.getfile(scene_cls)).resolve().parent)
+        except TypeError:
+            pass
+        modules = [module for _, module in sorted(sys.modules.items())
+                   if getattr(module, "__file__", None) and Path(module.__file__).resolve().parent in folders]
+        return code_digest(*classes, *modules)
+
+    def _source(self, name):
+        try:
+            return inspect.getsource(getattr(self.scene, name))
+        except (OSError, TypeError):
+            return None
+
+    def start(self, segment):
+        """Number the following play calls from 0, as part of ``segment``."""
+        self.segment, self.index = segment, 0
+        # the same segment gets the same keys whether it is rendered alone or as part of the whole scene
+        state = dict(self.scene.segments).get(segment)
+        self._prefix = json.dumps([type(self.scene).__qualname__, self.params, self._code, segment,
+                                   self._source(segment), state and self._source(state)], sort_keys=True, default=str)
+
+    def key(self, scene_object, camera_object, animations_list, current_mobjects_list):
+        if self._prefix is None:
+            return self._original(scene_object, camera_object, animations_list, current_mobjects_list)
+        animations = [(type(animation).__name__, animation.run_time) for animation in animations_list]
+        digest = hashlib.sha256(f"{self._prefix}{self.index}{animations}".encode()).hexdigest()
+        self.index += 1
+        return f"{self.segment}_{self.index:05d}_{digest[:32]}"
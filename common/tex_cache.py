@@ -0,0 +1,142 @@
+import hashlib
+import pickle
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import manim
+import manim.utils.tex_file_writing as tex_file_writing
+from manim import *
+
+
+def _build(spec):
+    """The pickled mobject (None if it can't be pickled) and how many LaTeX compiles building it took."""
+    cls, strings, kwargs = spec
+    compiles = 0
+    compile_tex = tex_file_writing.compile_tex
+
+    def counted(*args, **kwargs):
+        nonlocal compiles
+        compiles += 1
+        return compile_tex(*args, **kwargs)
+
+    tex_file_writing.compile_tex = counted
+    try:
+        return pickle.dumps(cls(*strings, **kwargs), protocol=pickle.HIGHEST_PROTOCOL), compiles
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None, compiles
+    finally:
+        tex_file_writing.compile_tex = compile_tex
+
+
+class TexCache:
+    """Content-keyed cache of Tex / MathTex mobjects, so a label is compiled and parsed once.
+
+    ``get`` hands out copies of a cached mobject. Entries live in an LRU of ``max_entries`` mobjects and
+    are pickled to ``cache_dir`` (``<media_dir>/tex_cache`` by default) so later runs skip LaTeX entirely.
+    ``warm`` compiles a whole label set in a process pool before the scene starts; what it built and the
+    LaTeX compiles that took are counted in ``warm_misses`` and ``warm_compiles``.
+    """
+
+    def __init__(self, max_entries: int = 1024, cache_dir=None, max_disk_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self._cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.warm_misses = 0
+        self.warm_compiles = 0
+        self._disk_writes = 0
+
+    @property
+    def cache_dir(self):
+        # resolved lazily, the media_dir is only final once manim has parsed its command line
+        path = Path(self._cache_dir or Path(config.media_dir) / "tex_cache")
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    @staticmethod
+    def key(cls, strings, kwargs):
+        template = kwargs.get("tex_template") or config.tex_template
+        content = repr((cls.__module__, cls.__qualname__, tuple(strings), sorted(kwargs.items(), key=repr),
+                        manim.__version__, getattr(template, "body", None)))
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def _remember(self, key, mobject):
+        self.entries[key] = mobject
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _load(self, key):
+        path = self.cache_dir / f"{key}.pickle"
+        try:
+            with open(path, "rb") as f:
+                mobject = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        path.touch()
+        return mobject
+
+    def _store(self, key, data):
+        if data is None:
+            return
+        (self.cache_dir / f"{key}.pickle").write_bytes(data)
+        self._disk_writes += 1
+        if self._disk_writes % 64 == 0:
+            self.prune()
+
+    def get(self, cls, *strings, **kwargs):
+        key = self.key(cls, strings, kwargs)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key].copy()
+        mobject = self._load(key)
+        if mobject is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            mobject = cls(*strings, **kwargs)
+            try:
+                self._store(key, pickle.dumps(mobject, protocol=pickle.HIGHEST_PROTOCOL))
+            except (pickle.PicklingError, TypeError, AttributeError):
+                pass
+        self._remember(key, mobject)
+        return mobject.copy()
+
+    def warm(self, specs, processes=None):
+        """Compile every ``(cls, strings, kwargs)`` spec that isn't on disk yet, in parallel."""
+        missing = {}
+        for cls, strings, kwargs in specs:
+            key = self.key(cls, strings, kwargs)
+            if key not in self.entries and not (self.cache_dir / f"{key}.pickle").exists():
+                missing[key] = (cls, tuple(strings), dict(kwargs))
+        if not missing:
+            return 0
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            for key, (data, compiles) in zip(missing, pool.map(_build, missing.values(), chunksize=8)):
+                self._store(key, data)
+                self.warm_compiles += compiles
+        self.warm_misses += len(missing)
+        self.prune()
+        return len(missing)
+
+    def prune(self):
+        """Drop the least recently used pickles until the cache fits in ``max_disk_bytes``."""
+        files = sorted(self.cache_dir.glob("*.pickle"), key=lambda path: path.stat().st_mtime)
+        total = sum(path.stat().st_size for path in files)
+        for path in files:
+            if total <= self.max_disk_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+    def stats(self):
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "warm_misses": self.warm_misses, "warm_compiles": self.warm_compiles, "entries": len(self.entries)}
+
+
+tex_cache = TexCache()